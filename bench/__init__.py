@@ -0,0 +1 @@
+"""Offline replay harness and benchmarks for the NHL goal light (fake NHL API, fake Kasa bulbs, benchmark runner)."""
@@ -0,0 +1,239 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import main
+
+# Function to build a boxscore shaped like the real one (full rosters and per-player stats)
+def synthetic_boxscore(game_id=2026020001, away="TOR", home="MTL", seed=1):
+    """Build a boxscore with the same top-level layout and roughly the size of a live api-web.nhle.com boxscore."""
+    rng = random.Random(seed)
+
+    def skater(number):
+        return {
+            "playerId": 8470000 + number, "sweaterNumber": number,
+            "name": {"default": f"P. Player{number}"}, "position": rng.choice(["C", "L", "R", "D"]),
+            "goals": rng.randint(0, 2), "assists": rng.randint(0, 2), "points": rng.randint(0, 3),
+            "plusMinus": rng.randint(-2, 2), "pim": rng.choice([0, 0, 2]), "hits": rng.randint(0, 5),
+            "powerPlayGoals": 0, "sog": rng.randint(0, 6), "faceoffWinningPctg": rng.random(),
+            "toi": f"{rng.randint(8, 24):02d}:{rng.randint(0, 59):02d}", "blockedShots": rng.randint(0, 3),
+            "shifts": rng.randint(12, 30), "giveaways": rng.randint(0, 2), "takeaways": rng.randint(0, 2)
+        }
+
+    def goalie(number):
+        return {
+            "playerId": 8480000 + number, "sweaterNumber": number, "name": {"default": f"G. Goalie{number}"},
+            "position": "G", "evenStrengthShotsAgainst": "20/22", "powerPlayShotsAgainst": "5/5",
+            "shorthandedShotsAgainst": "0/0", "saveShotsAgainst": "25/27", "savePctg": 0.926,
+            "evenStrengthGoalsAgainst": 2, "powerPlayGoalsAgainst": 0, "shorthandedGoalsAgainst": 0,
+            "pim": 0, "goalsAgainst": 2, "toi": "58:12", "starter": number == 30, "shotsAgainst": 27, "saves": 25
+        }
+
+    def team_stats():
+        return {
+            "forwards": [skater(number) for number in range(10, 22)],
+            "defense": [skater(number) for number in range(40, 46)],
+            "goalies": [goalie(30), goalie(31)]
+        }
+
+    def team(abbrev, score):
+        return {
+            "id": rng.randint(1, 60), "commonName": {"default": abbrev}, "abbrev": abbrev, "score": score,
+            "sog": rng.randint(15, 40), "logo": f"https://assets.nhle.com/logos/nhl/svg/{abbrev}_light.svg",
+            "darkLogo": f"https://assets.nhle.com/logos/nhl/svg/{abbrev}_dark.svg",
+            "placeName": {"default": abbrev}, "placeNameWithPreposition": {"default": abbrev, "fr": abbrev}
+        }
+
+    return {
+        "id": game_id, "season": 20262027, "gameType": 2, "limitedScoring": False, "gameDate": "2026-10-17",
+        "venue": {"default": "Arena"}, "venueLocation": {"default": "City"}, "startTimeUTC": "2026-10-17T23:00:00Z",
+        "easternUTCOffset": "-04:00", "venueUTCOffset": "-04:00",
+        "tvBroadcasts": [{"id": index, "market": "N", "countryCode": "US", "network": f"NET{index}"} for index in range(4)],
+        "gameState": "LIVE", "gameScheduleState": "OK",
+        "periodDescriptor": {"number": 2, "periodType": "REG", "maxRegulationPeriods": 3},
+        "awayTeam": team(away, 2), "homeTeam": team(home, 3),
+        "clock": {"timeRemaining": "12:34", "secondsRemaining": 754, "running": True, "inIntermission": False},
+        "playerByGameStats": {"awayTeam": team_stats(), "homeTeam": team_stats()},
+        "summary": {
+            "scoring": [
+                {"periodDescriptor": {"number": period}, "goals": [skater(number) for number in range(10, 13)]}
+                for period in range(1, 4)
+            ],
+            "penalties": [{"periodDescriptor": {"number": period}, "penalties": []} for period in range(1, 4)],
+            "threeStars": []
+        },
+        "gameOutcome": None,
+        "regPeriods": 3
+    }
+
+# Function to build a score feed shaped like the real one (every game with its goals and highlight links)
+def synthetic_score_feed(games=16, goals_per_game=5, seed=1):
+    """Build a /score/{date} response for a busy night, roughly the size of a live one late in the evening."""
+    rng = random.Random(seed)
+    teams = sorted(main.TEAM_COLORS)
+    rng.shuffle(teams)
+
+    def goal(index, away, home):
+        scorer = 8470000 + rng.randint(0, 999)
+        return {
+            "period": index % 3 + 1, "periodDescriptor": {"number": index % 3 + 1, "periodType": "REG", "maxRegulationPeriods": 3},
+            "timeInPeriod": f"{rng.randint(0, 19):02d}:{rng.randint(0, 59):02d}", "playerId": scorer,
+            "name": {"default": f"P. Player{scorer}"}, "firstName": {"default": "Player"}, "lastName": {"default": f"Player{scorer}"},
+            "goalModifier": "none",
+            "assists": [
+                {"playerId": 8470000 + rng.randint(0, 999), "name": {"default": "A. Assist"}, "assistsToDate": rng.randint(1, 40)}
+                for _ in range(rng.randint(0, 2))
+            ],
+            "mugshot": f"https://assets.nhle.com/mugs/nhl/20262027/{away}/{scorer}.png",
+            "teamAbbrev": rng.choice([away, home]), "goalsToDate": rng.randint(1, 40),
+            "awayScore": rng.randint(0, 4), "homeScore": rng.randint(0, 4), "strength": "ev",
+            "highlightClipSharingUrl": f"https://nhl.com/video/goal-{scorer}-{index}",
+            "highlightClip": rng.randint(6300000000000, 6400000000000),
+            "discreteClip": rng.randint(6300000000000, 6400000000000)
+        }
+
+    def team(abbrev, score):
+        return {
+            "id": rng.randint(1, 60), "name": {"default": abbrev}, "abbrev": abbrev, "score": score,
+            "sog": rng.randint(15, 40), "logo": f"https://assets.nhle.com/logos/nhl/svg/{abbrev}_light.svg"
+        }
+
+    feed_games = []
+    for index in range(games):
+        away, home = teams[(2 * index) % len(teams)], teams[(2 * index + 1) % len(teams)]
+        feed_games.append({
+            "id": 2026020001 + index, "season": 20262027, "gameType": 2, "gameDate": "2026-10-17",
+            "venue": {"default": "Arena"}, "startTimeUTC": "2026-10-17T23:00:00Z",
+            "easternUTCOffset": "-04:00", "venueUTCOffset": "-04:00",
+            "tvBroadcasts": [{"id": number, "market": "N", "countryCode": "US", "network": f"NET{number}"} for number in range(4)],
+            "gameState": "LIVE", "gameScheduleState": "OK",
+            "awayTeam": team(away, rng.randint(0, 4)), "homeTeam": team(home, rng.randint(0, 4)),
+            "gameCenterLink": f"/gamecenter/{away.lower()}-vs-{home.lower()}/2026/10/17/{2026020001 + index}",
+            "threeMinRecap": f"/video/recap-{index}", "neutralSite": False, "venueTimezone": "America/New_York",
+            "clock": {"timeRemaining": "12:34", "secondsRemaining": 754, "running": True, "inIntermission": False},
+            "period": 2, "periodDescriptor": {"number": 2, "periodType": "REG", "maxRegulationPeriods": 3},
+            "goals": [goal(number, away, home) for number in range(goals_per_game)]
+        })
+    return {
+        "prevDate": "2026-10-16", "currentDate": "2026-10-17", "nextDate": "2026-10-18",
+        "gameWeek": [{"date": f"2026-10-{day}", "dayAbbrev": "SAT", "numberOfGames": games} for day in range(14, 21)],
+        "oddsPartners": [{"partnerId": number, "country": "US", "name": f"Partner{number}"} for number in range(6)],
+        "games": feed_games
+    }
+
+# Function to collect the raw response bodies a recording would serve
+def recorded_payloads(recording):
+    """Return {"boxscore": [...], "score": [...], "play-by-play": [...]} bodies from a recording (distinct payloads only)."""
+    payloads = {"boxscore": [], "score": [], "play-by-play": []}
+    seen = set()
+    for frame in recording["frames"]:
+        bodies = [("score", frame.get("score"))]
+        bodies += [("boxscore", data) for data in frame.get("boxscore", {}).values()]
+        bodies += [("play-by-play", data) for data in frame.get("play-by-play", {}).values()]
+        for endpoint, data in bodies:
+            if data is None:
+                continue
+            body = json.dumps(data).encode()
+            if body not in seen:
+                seen.add(body)
+                payloads[endpoint].append(body)
+    return payloads
+
+# The decode path before lean decoding: the whole body with the standard library, then a dict per poll
+def game_dict(data):
+    """Build the per-poll dict the monitors used to receive."""
+    game_data = {
+        "away_team": data["awayTeam"]["abbrev"],
+        "home_team": data["homeTeam"]["abbrev"],
+        "game_state": data.get("gameState", ""),
+    }
+    if "score" in data["awayTeam"] and "score" in data["homeTeam"]:
+        game_data["away_score"] = data["awayTeam"]["score"]
+        game_data["home_score"] = data["homeTeam"]["score"]
+    return game_data
+
+def full_parse_game_data(body):
+    """Decode a whole boxscore with the standard library."""
+    return game_dict(json.loads(body))
+
+def full_parse_scoreboard(body):
+    """Decode a whole score feed with the standard library and build a dict for each game."""
+    return [game_dict(game) for game in json.loads(body).get("games", [])]
+
+def lean_parse_game_data(body):
+    """Decode a boxscore the way get_game_data does now."""
+    return main.parse_game_data(main.decode_boxscore(body))
+
+def lean_parse_scoreboard(body):
+    """Decode a score feed the way the scoreboard poller does now."""
+    return [main.parse_game_data(game) for game in main.decode_json(body).get("games", [])]
+
+def measure(function, bodies, seconds):
+    """Return (mean microseconds per payload, peak bytes allocated by one call on the largest payload)."""
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for body in bodies:
+            function(body)
+        calls += len(bodies)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    function(max(bodies, key=len))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed / calls * 1e6, peak
+
+def run(args):
+    """Time the old and new decode paths on each kind of payload and print a report."""
+    if args.recording:
+        with open(args.recording) as f:
+            payloads = recorded_payloads(json.load(f))
+    else:
+        payloads = {"boxscore": [], "score": [], "play-by-play": []}
+    if not payloads["score"]:
+        # The score feed is polled every tick, so it's always measured
+        payloads["score"] = [json.dumps(synthetic_score_feed(seed=seed)).encode() for seed in range(8)]
+    if not payloads["boxscore"]:
+        # Recordings only carry boxscores when made with --boxscore
+        payloads["boxscore"] = [json.dumps(synthetic_boxscore(seed=seed)).encode() for seed in range(8)]
+
+    paths = {
+        "score": (lean_parse_scoreboard, full_parse_scoreboard),
+        "boxscore": (lean_parse_game_data, full_parse_game_data),
+        "play-by-play": (main.decode_json, json.loads)
+    }
+
+    decoders = ["orjson", "json"] if main.orjson is not None else ["json"]
+    result = {}
+    for endpoint, (lean, full) in paths.items():
+        bodies = payloads[endpoint]
+        if not bodies:
+            continue
+        full_us, full_peak = measure(full, bodies, args.seconds)
+        report = {
+            "payloads": len(bodies),
+            "mean_bytes": sum(map(len, bodies)) // len(bodies),
+            "before": {"us": round(full_us, 1), "peak_bytes": full_peak}
+        }
+        orjson = main.orjson
+        for decoder in decoders:
+            main.orjson = orjson if decoder == "orjson" else None
+            lean_us, lean_peak = measure(lean, bodies, args.seconds)
+            report[f"lean ({decoder})"] = {
+                "us": round(lean_us, 1),
+                "peak_bytes": lean_peak,
+                "speedup": round(full_us / lean_us, 2)
+            }
+        main.orjson = orjson
+        result[endpoint] = report
+
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the full and lean JSON decode paths on recorded payloads.")
+    parser.add_argument("--recording", help="recording made with bench.fake_api record (synthetic score feeds and boxscores otherwise)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent on each measurement")
+    run(parser.parse_args())
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+
+# Stand-in for api-web.nhle.com that replays a recording
+#
+# A recording is a JSON document:
+#   {
+#     "schedule": <schedule response>,
+#     "frames": [
+#       {"t": <seconds from start>, "score": <score feed response>,
+#        "boxscore": {"<game id>": <boxscore response>, ...},        (optional)
+#        "play-by-play": {"<game id>": <play-by-play response>, ...}}  (optional)
+#     ]
+#   }
+# Each request is answered from the latest frame whose time has passed. Games without a recorded
+# boxscore get one built from their score feed entry.
+class FakeNHLApi:
+    """Replay a recorded game night over HTTP at real or accelerated speed, with optional errors and slowdowns."""
+
+    def __init__(self, recording, speed=1.0, error_rate=0.0, slow_rate=0.0, slow_delay=0.0, seed=None):
+        self.recording = recording
+        self.frames = recording["frames"]
+        self.frame_times = [frame["t"] for frame in self.frames]
+        self.speed = speed  # Replay seconds per real second
+        self.error_rate = error_rate  # Fraction of requests answered with a 503
+        self.slow_rate = slow_rate  # Fraction of requests delayed by slow_delay seconds
+        self.slow_delay = slow_delay
+        self.random = random.Random(seed)
+        self.started_at = None  # Unix time the replay started
+        self.runner = None
+        self.encoded = {}  # (frame index, endpoint, game id) -> (response bytes, ETag)
+        self.requests = {}  # endpoint -> request count
+        self.bytes_sent = 0
+        self.errors_injected = 0
+        self.slowdowns_injected = 0
+        self.extra_stats = None  # Optional callable returning more entries for /_stats
+
+    def app(self):
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/v1/schedule/{date}", self.handle_schedule)
+        app.router.add_get("/v1/score/{date}", self.handle_score)
+        app.router.add_get("/v1/gamecenter/{game_id}/boxscore", self.handle_boxscore)
+        app.router.add_get("/v1/gamecenter/{game_id}/play-by-play", self.handle_play_by_play)
+        app.router.add_get("/_stats", self.handle_stats)
+        return app
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Start serving and start the replay clock."""
+        self.runner = web.AppRunner(self.app())
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        self.started_at = time.time()
+
+    async def stop(self):
+        """Stop serving."""
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def replay_time(self):
+        """Seconds of the recording that have played so far."""
+        return (time.time() - self.started_at) * self.speed
+
+    def frame_index(self):
+        """Index of the frame currently being served."""
+        return max(0, bisect.bisect_right(self.frame_times, self.replay_time()) - 1)
+
+    def goal_marks(self):
+        """Return every goal in the recording with the Unix time it first became visible in the score feed."""
+        marks = []
+        previous = {}
+        for frame in self.frames:
+            for game in (frame["score"] or {}).get("games", []):
+                for side in ["awayTeam", "homeTeam"]:
+                    team = game[side]
+                    score = team.get("score")
+                    if score is None:
+                        continue
+                    key = (game["id"], team["abbrev"])
+                    for goal in range(previous.get(key, 0) + 1, score + 1):
+                        marks.append({
+                            "game_id": game["id"],
+                            "team": team["abbrev"],
+                            "score": goal,
+                            "at": self.started_at + frame["t"] / self.speed
+                        })
+                    previous[key] = score
+        return marks
+
+    def stats(self):
+        """Summarize what the clients asked for."""
+        return {
+            "requests": dict(self.requests),
+            "total_requests": sum(self.requests.values()),
+            "bytes_sent": self.bytes_sent,
+            "errors_injected": self.errors_injected,
+            "slowdowns_injected": self.slowdowns_injected,
+            "goal_marks": self.goal_marks(),
+            **(self.extra_stats() if self.extra_stats else {})
+        }
+
+    async def respond(self, request, endpoint, build, game_id=None):
+        """Count the request, inject faults, and answer with the current frame's (cached) JSON.
+
+        Responses carry an ETag, and a matching If-None-Match is answered with 304 Not Modified.
+        """
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+        roll = self.random.random()
+        if roll < self.error_rate:
+            self.errors_injected += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if roll < self.error_rate + self.slow_rate:
+            self.slowdowns_injected += 1
+            await asyncio.sleep(self.slow_delay)
+
+        index = self.frame_index()
+        key = (index, endpoint, game_id)
+        if key not in self.encoded:
+            data = build(self.frames[index])
+            if data is None:
+                self.encoded[key] = (None, None)
+            else:
+                body = json.dumps(data).encode()
+                self.encoded[key] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        body, etag = self.encoded[key]
+        if body is None:
+            return web.Response(status=404, text="Not Found")
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    async def handle_schedule(self, request):
+        return await self.respond(request, "schedule", lambda frame: self.recording["schedule"])
+
+    async def handle_score(self, request):
+        return await self.respond(request, "score", lambda frame: frame["score"])
+
+    async def handle_boxscore(self, request):
+        game_id = request.match_info["game_id"]
+
+        def build(frame):
+            if game_id in frame.get("boxscore", {}):
+                return frame["boxscore"][game_id]
+            for game in (frame["score"] or {}).get("games", []):
+                if str(game["id"]) == game_id:
+                    return game
+            return None
+
+        return await self.respond(request, "boxscore", build, game_id)
+
+    async def handle_play_by_play(self, request):
+        game_id = request.match_info["game_id"]
+        return await self.respond(request, "play-by-play", lambda frame: frame.get("play-by-play", {}).get(game_id), game_id)
+
+    async def handle_stats(self, request):
+        return web.json_response(self.stats())
+
+# Function to record a real game night so it can be replayed later
+async def record(path, date, interval, duration, play_by_play, boxscore=False, api_base="https://api-web.nhle.com/v1"):
+    """Poll the real API every interval seconds for duration seconds and save the responses as a recording."""
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        async def get(url):
+            async with session.get(url) as response:
+                return await response.json() if response.status == 200 else None
+
+        recording = {"schedule": await get(f"{api_base}/schedule/{date}"), "frames": []}
+        started_at = time.time()
+        while time.time() - started_at < duration:
+            frame = {"t": round(time.time() - started_at, 3), "score": await get(f"{api_base}/score/{date}")}
+            if play_by_play and frame["score"]:
+                live = [game["id"] for game in frame["score"].get("games", []) if game.get("gameState") in ["LIVE", "CRIT"]]
+                frame["play-by-play"] = {
+                    str(game_id): await get(f"{api_base}/gamecenter/{game_id}/play-by-play") for game_id in live
+                }
+            if boxscore and frame["score"]:
+                live = [game["id"] for game in frame["score"].get("games", []) if game.get("gameState") in ["LIVE", "CRIT"]]
+                frame["boxscore"] = {
+                    str(game_id): await get(f"{api_base}/gamecenter/{game_id}/boxscore") for game_id in live
+                }
+            recording["frames"].append(frame)
+            print(f"Recorded frame {len(recording['frames'])} at {frame['t']:.0f}s")
+
+            # Stop early once every game is over
+            games = (frame["score"] or {}).get("games", [])
+            if games and all(game.get("gameState") in ["FINAL", "OFF"] for game in games):
+                break
+            await asyncio.sleep(interval)
+
+    with open(path, "w") as f:
+        json.dump(recording, f)
+    print(f"Saved {len(recording['frames'])} frames to {path}")
+
+async def serve(path, host, port, speed, error_rate, slow_rate, slow_delay):
+    """Replay a recording until interrupted."""
+    with open(path) as f:
+        recording = json.load(f)
+    api = FakeNHLApi(recording, speed, error_rate, slow_rate, slow_delay)
+    await api.start(host, port)
+    print(f"Replaying {path} at http://{host}:{port}/v1 ({speed}x speed)")
+    print(f"Run the goal light against it with: NHL_API_BASE=http://{host}:{port}/v1 python main.py")
+    while True:
+        await asyncio.sleep(3600)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay NHL API responses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="replay a recording over HTTP")
+    serve_parser.add_argument("recording")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--speed", type=float, default=1.0, help="replay seconds per real second")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    serve_parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of requests delayed")
+    serve_parser.add_argument("--slow-delay", type=float, default=2.0, help="delay in seconds for slow requests")
+
+    record_parser = commands.add_parser("record", help="record the real API for later replay")
+    record_parser.add_argument("recording")
+    record_parser.add_argument("--date", default=time.strftime("%Y-%m-%d"))
+    record_parser.add_argument("--interval", type=float, default=5.0, help="seconds between frames")
+    record_parser.add_argument("--duration", type=float, default=4 * 3600, help="longest time to record in seconds")
+    record_parser.add_argument("--play-by-play", action="store_true", help="also record play-by-play for live games")
+    record_parser.add_argument("--boxscore", action="store_true", help="also record boxscores for live games")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.recording, args.host, args.port, args.speed, args.error_rate, args.slow_rate, args.slow_delay))
+        else:
+            asyncio.run(record(args.recording, args.date, args.interval, args.duration, args.play_by_play, args.boxscore))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import json
+import struct
+import time
+
+from kasa.transports.xortransport import XorEncryption
+
+# Kasa bulbs listen on this TCP port; run several fakes on different loopback addresses (127.0.0.2, 127.0.0.3, ...)
+KASA_PORT = 9999
+
+LIGHT_SERVICE = "smartlife.iot.smartbulb.lightingservice"
+
+# Canned replies for the module queries python-kasa sends during update()
+MODULE_REPLIES = {
+    "get_timezone": {"index": 18},
+    "get_rules": {"rule_list": [], "enable": 0, "version": 2},
+    "get_next_action": {"type": -1},
+    "get_daystat": {"day_list": []},
+    "get_monthstat": {"month_list": []},
+    "get_info": {"binded": 0, "cld_connection": 0, "server": "", "username": ""},
+}
+
+# Stand-in for a Kasa color bulb that records every command it receives
+class FakeBulb:
+    """Speak the Kasa (XOR) protocol on host:KASA_PORT, keep a light state and log each request with its arrival time."""
+
+    def __init__(self, host="127.0.0.1", latency=0.0, offline=False):
+        self.host = host
+        self.latency = latency  # Extra delay (in seconds) before every reply
+        self.offline = offline  # Drop connections without replying
+        self.light_state = {
+            "on_off": 1,
+            "mode": "normal",
+            "hue": 30,
+            "saturation": 20,
+            "color_temp": 0,
+            "brightness": 80
+        }
+        self.commands = []  # (Unix time received, request dict) for every request
+        self.server = None
+
+    async def start(self):
+        """Start listening."""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, KASA_PORT)
+
+    async def stop(self):
+        """Stop listening."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def light_commands(self):
+        """Return (Unix time, arguments) for every light state change received."""
+        return [
+            (received_at, request[LIGHT_SERVICE]["transition_light_state"])
+            for received_at, request in self.commands
+            if "transition_light_state" in request.get(LIGHT_SERVICE, {})
+        ]
+
+    def reported_light_state(self):
+        """Return the light state as a real bulb reports it; while off, the color sits under dft_on_state."""
+        if self.light_state["on_off"]:
+            return dict(self.light_state)
+        color = {key: value for key, value in self.light_state.items() if key != "on_off"}
+        return {"on_off": 0, "dft_on_state": color}
+
+    def sysinfo(self):
+        """Build the get_sysinfo reply for a KL130 color bulb."""
+        return {
+            "sw_ver": "1.8.11 Build 191113 Rel.105336",
+            "hw_ver": "2.0",
+            "model": "KL130(US)",
+            "deviceId": "FAKE" + self.host.replace(".", ""),
+            "oemId": "FAKE",
+            "hwId": "FAKE",
+            "rssi": -50,
+            "longitude_i": 0,
+            "latitude_i": 0,
+            "alias": f"Fake bulb {self.host}",
+            "status": "new",
+            "description": "Smart Wi-Fi LED Bulb with Color Changing",
+            "mic_type": "IOT.SMARTBULB",
+            "mic_mac": "000000000000",
+            "dev_state": "normal",
+            "is_factory": False,
+            "disco_ver": "1.0",
+            "ctrl_protocols": {"name": "Linkie", "version": "1.0"},
+            "active_mode": "none",
+            "is_dimmable": 1,
+            "is_color": 1,
+            "is_variable_color_temp": 1,
+            "light_state": self.reported_light_state(),
+            "preferred_state": [],
+            "err_code": 0
+        }
+
+    def reply(self, request):
+        """Build the reply for one request, applying any light state change."""
+        response = {}
+        for module, methods in request.items():
+            response[module] = {}
+            for method, args in methods.items():
+                if method == "get_sysinfo":
+                    result = self.sysinfo()
+                elif method == "transition_light_state":
+                    self.light_state.update({key: value for key, value in args.items() if key in self.light_state})
+                    result = dict(self.reported_light_state(), err_code=0)
+                elif method == "get_light_state":
+                    result = dict(self.reported_light_state(), err_code=0)
+                elif method == "get_time":
+                    now = time.localtime()
+                    result = {
+                        "year": now.tm_year, "month": now.tm_mon, "mday": now.tm_mday,
+                        "hour": now.tm_hour, "min": now.tm_min, "sec": now.tm_sec, "err_code": 0
+                    }
+                elif method in MODULE_REPLIES:
+                    result = dict(MODULE_REPLIES[method], err_code=0)
+                else:
+                    result = {"err_code": -1, "err_msg": "module not support"}
+                response[module][method] = result
+        return response
+
+    async def handle_connection(self, reader, writer):
+        """Answer length-prefixed XOR requests until the client disconnects."""
+        try:
+            while True:
+                (length,) = struct.unpack(">I", await reader.readexactly(4))
+                request = json.loads(XorEncryption.decrypt(await reader.readexactly(length)))
+                self.commands.append((time.time(), request))
+                if self.offline:
+                    break
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(XorEncryption.encrypt(json.dumps(self.reply(request))))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(hosts, latency):
+    """Run fake bulbs until interrupted, printing every light change they receive."""
+    bulbs = [FakeBulb(host, latency) for host in hosts]
+    for bulb in bulbs:
+        await bulb.start()
+        print(f"Fake bulb listening on {bulb.host}:{KASA_PORT}")
+
+    printed = [0] * len(bulbs)
+    while True:
+        await asyncio.sleep(0.1)
+        for index, bulb in enumerate(bulbs):
+            commands = bulb.light_commands()
+            for received_at, args in commands[printed[index]:]:
+                print(f"{received_at:.3f} {bulb.host} {args}")
+            printed[index] = len(commands)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run fake Kasa bulbs that log the commands they receive.")
+    parser.add_argument("hosts", nargs="*", default=["127.0.0.1"], help="loopback addresses to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="extra reply delay in seconds")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.hosts, args.latency))
+    except KeyboardInterrupt:
+        pass
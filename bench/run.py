@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+import main
+from bench.fake_api import FakeNHLApi
+from bench.fake_bulb import FakeBulb
+
+API_PORT = 8765  # Port the fake NHL API listens on during a benchmark
+
+# Function to build a synthetic busy game night
+def heavy_night(games=16, duration=120.0, goals_per_game=6, clusters=4, step=0.5, seed=1):
+    """Build a recording where every game is live from the start and goals bunch up across games.
+
+    Each game has an intermission in the middle and ends (OFF) at duration seconds. Every frame carries
+    the score feed and each game's play-by-play (goals only).
+    """
+    rng = random.Random(seed)
+    teams = sorted(main.TEAM_COLORS)
+    rng.shuffle(teams)
+    today = datetime.date.today().isoformat()
+    start_time = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    intermission = (duration * 0.45, duration * 0.55)
+
+    # Goals land around a few shared moments so several games score within seconds of each other
+    centers = [rng.uniform(5, duration - 10) for _ in range(clusters)]
+    schedule_games = []
+    goal_times = {}  # (game id, side) -> sorted goal times
+    for index in range(games):
+        game_id = 2026020001 + index
+        away, home = teams[(2 * index) % len(teams)], teams[(2 * index + 1) % len(teams)]
+        schedule_games.append({
+            "id": game_id,
+            "gameState": "LIVE",
+            "startTimeUTC": start_time,
+            "awayTeam": {"abbrev": away, "placeName": {"default": away}, "commonName": {"default": "Away"}},
+            "homeTeam": {"abbrev": home, "placeName": {"default": home}, "commonName": {"default": "Home"}}
+        })
+        for side in ["awayTeam", "homeTeam"]:
+            goal_times[(game_id, side)] = []
+        for _ in range(goals_per_game):
+            at = min(duration - 2, max(1, rng.choice(centers) + rng.uniform(-2, 2)))
+            if intermission[0] <= at < intermission[1]:
+                at = intermission[1] + rng.uniform(0, 2)
+            goal_times[(game_id, rng.choice(["awayTeam", "homeTeam"]))].append(at)
+
+    frames = []
+    t = 0.0
+    while t <= duration:
+        feed_games = []
+        play_by_play = {}
+        for index, game in enumerate(schedule_games):
+            in_intermission = intermission[0] <= t < intermission[1]
+            remaining = int(intermission[1] - t) if in_intermission else int(duration - t)
+            entry = {
+                "id": game["id"],
+                "gameState": "OFF" if t >= duration else "LIVE",
+                "startTimeUTC": start_time,
+                "period": 2 if t >= intermission[1] else 1,
+                "clock": {
+                    "timeRemaining": f"{remaining // 60:02d}:{remaining % 60:02d}",
+                    "secondsRemaining": remaining,
+                    "running": not in_intermission,
+                    "inIntermission": in_intermission
+                }
+            }
+            plays = []
+            for side_index, side in enumerate(["awayTeam", "homeTeam"]):
+                team_id = 2 * index + side_index + 1
+                goals = [at for at in goal_times[(game["id"], side)] if at <= t]
+                entry[side] = {"id": team_id, "abbrev": game[side]["abbrev"], "score": len(goals)}
+                for at in goals:
+                    plays.append({
+                        "eventId": int(at * 1000) * 10 + side_index,
+                        "sortOrder": int(at * 1000) * 10 + side_index,
+                        "typeDescKey": "goal",
+                        "periodDescriptor": {"number": 2 if at >= intermission[1] else 1},
+                        "timeInPeriod": f"{int(at) // 60:02d}:{int(at) % 60:02d}",
+                        "details": {"eventOwnerTeamId": team_id, "scoringPlayerId": team_id * 100}
+                    })
+            plays.sort(key=lambda play: play["sortOrder"])
+            play_by_play[str(game["id"])] = {
+                "id": game["id"],
+                "gameState": entry["gameState"],
+                "awayTeam": entry["awayTeam"],
+                "homeTeam": entry["homeTeam"],
+                "rosterSpots": [
+                    {"playerId": team["id"] * 100, "teamId": team["id"],
+                     "firstName": {"default": "Top"}, "lastName": {"default": team["abbrev"] + " Scorer"}}
+                    for team in [entry["awayTeam"], entry["homeTeam"]]
+                ],
+                "plays": plays
+            }
+            feed_games.append(entry)
+        frames.append({
+            "t": round(t, 3),
+            "score": {"currentDate": today, "games": feed_games},
+            "play-by-play": play_by_play
+        })
+        t += step
+
+    return {
+        "schedule": {"gameWeek": [{"date": today, "games": schedule_games}]},
+        "frames": frames
+    }
+
+# Function run in a child process so the fake world's CPU isn't charged to the goal light
+def serve_world(recording, speed, error_rate, slow_rate, slow_delay, bulb_hosts, bulb_latency, ready):
+    """Serve the fake API and fake bulbs until the process is terminated."""
+    async def run():
+        bulbs = [FakeBulb(host, bulb_latency) for host in bulb_hosts]
+        for bulb in bulbs:
+            await bulb.start()
+        api = FakeNHLApi(recording, speed, error_rate, slow_rate, slow_delay, seed=1)
+        api.extra_stats = lambda: {"bulb_commands": {bulb.host: bulb.light_commands() for bulb in bulbs}}
+        await api.start("127.0.0.1", API_PORT)
+        ready.set()
+        while True:
+            await asyncio.sleep(3600)
+
+    asyncio.run(run())
+
+# Function to run the real goal light pipeline against the fake world
+async def run_pipeline(games, bulb_hosts):
+    """Monitor every game with the real poller, monitors and light controller; returns goal detections."""
+    main.BULB_GROUP = main.BulbGroup(bulb_hosts)
+    await main.capture_original_bulb_state()
+
+    # Tap the goal queue so we know when each goal was detected
+    goal_queue = asyncio.Queue()
+    light_queue = asyncio.Queue()
+    detections = []
+
+    async def tap():
+        while True:
+            goal = await goal_queue.get()
+            if goal is not None and goal["type"] == "goal":
+                detections.append({"game_id": goal["game_id"], "team": goal["team"], "at": time.time()})
+            light_queue.put_nowait(goal)
+            if goal is None:
+                return
+
+    tap_task = asyncio.create_task(tap())
+    controller_task = asyncio.create_task(main.light_controller(light_queue))
+    poller = main.ScoreboardPoller()
+    poller_task = asyncio.create_task(poller.run())
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    monitors = [
+        main.monitor_game({
+            "id": game["id"],
+            "start_time_utc": now,
+            "away_team": game["awayTeam"]["abbrev"],
+            "home_team": game["homeTeam"]["abbrev"],
+            "game_date": now.date().isoformat()
+        }, goal_queue, poller)
+        for game in games
+    ]
+    try:
+        await asyncio.gather(*monitors)
+    finally:
+        poller_task.cancel()
+        goal_queue.put_nowait(None)
+        await tap_task
+        await controller_task
+        await main.close_http_session()
+    return detections
+
+def percentile(values, fraction):
+    """Return the value at a fraction of the way through the sorted values (None if empty)."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def match_detections(marks, detections):
+    """Pair each goal in the recording with its detection (in order per game and team); returns latencies and misses."""
+    detected = {}
+    for detection in detections:
+        detected.setdefault((detection["game_id"], detection["team"]), []).append(detection["at"])
+
+    latencies = []
+    missed = 0
+    seen = {}
+    for mark in sorted(marks, key=lambda mark: mark["at"]):
+        key = (mark["game_id"], mark["team"])
+        index = seen.get(key, 0)
+        seen[key] = index + 1
+        times = detected.get(key, [])
+        if index < len(times):
+            latencies.append(times[index] - mark["at"])
+        else:
+            missed += 1
+    return latencies, missed
+
+async def fetch_stats():
+    """Fetch the fake world's request and bulb statistics."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"http://127.0.0.1:{API_PORT}/_stats") as response:
+            return await response.json()
+
+async def benchmark(games, bulb_hosts):
+    """Run the pipeline and measure CPU time and peak traced memory."""
+    tracemalloc.start()
+    cpu_started = time.process_time()
+    detections = await run_pipeline(games, bulb_hosts)
+    cpu = time.process_time() - cpu_started
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return detections, cpu, peak_memory, await fetch_stats()
+
+def report(games, detections, cpu, peak_memory, stats, wall):
+    """Build the benchmark report."""
+    latencies, missed = match_detections(stats["goal_marks"], detections)
+    detect_to_light = [
+        value
+        for scope in main.METRICS.histograms.values()
+        if "detect_to_light" in scope
+        for value in scope["detect_to_light"].recent
+    ]
+    game_count = len(games)
+    return {
+        "games": game_count,
+        "wall_seconds": round(wall, 2),
+        "goals": len(stats["goal_marks"]),
+        "goals_detected": len(latencies),
+        "goals_missed": missed,
+        "detection_latency": {
+            "p50": percentile(latencies, 0.5),
+            "p90": percentile(latencies, 0.9),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None
+        },
+        "detect_to_light": {
+            "p50": percentile(detect_to_light, 0.5),
+            "p99": percentile(detect_to_light, 0.99)
+        },
+        "requests": stats["requests"],
+        "requests_total": stats["total_requests"],
+        "requests_per_game": stats["total_requests"] / game_count,
+        "bytes_per_game": stats["bytes_sent"] / game_count,
+        "errors_injected": stats["errors_injected"],
+        "slowdowns_injected": stats["slowdowns_injected"],
+        "bulb_commands": {host: len(commands) for host, commands in stats["bulb_commands"].items()},
+        "cpu_seconds_per_game": cpu / game_count,
+        "peak_memory_bytes_per_game": peak_memory / game_count
+    }
+
+def run(args):
+    """Start the fake world, run the benchmark and print the report."""
+    if args.recording:
+        with open(args.recording) as f:
+            recording = json.load(f)
+    else:
+        recording = heavy_night(args.games, args.duration, args.goals, args.clusters, seed=args.seed)
+    games = [game for day in recording["schedule"]["gameWeek"] for game in day.get("games", [])]
+    bulb_hosts = [f"127.0.0.{index + 2}" for index in range(args.bulbs)]
+
+    # Point the goal light at the fake world and keep celebrations short
+    main.NHL_API_BASE = f"http://127.0.0.1:{API_PORT}/v1"
+    main.FLASH_DURATION = args.flash_duration
+    main.MIN_FLASH_DURATION = min(main.MIN_FLASH_DURATION, args.flash_duration)
+    main.METRICS_FILE = None
+
+    ready = multiprocessing.Event()
+    world = multiprocessing.Process(
+        target=serve_world,
+        args=(recording, args.speed, args.error_rate, args.slow_rate, args.slow_delay, bulb_hosts, args.bulb_latency, ready),
+        daemon=True
+    )
+    world.start()
+    try:
+        if not ready.wait(30):
+            sys.exit("Fake world failed to start")
+        started = time.time()
+        output = sys.stdout if args.verbose else io.StringIO()
+        with contextlib.redirect_stdout(output):
+            detections, cpu, peak_memory, stats = asyncio.run(benchmark(games, bulb_hosts))
+        result = report(games, detections, cpu, peak_memory, stats, time.time() - started)
+    finally:
+        world.terminate()
+        world.join()
+
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark goal detection against a fake NHL API and fake bulbs.")
+    parser.add_argument("--recording", help="replay a recorded night instead of the synthetic heavy night")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay seconds per real second")
+    parser.add_argument("--games", type=int, default=16, help="number of concurrent synthetic games")
+    parser.add_argument("--duration", type=float, default=120.0, help="length of the synthetic night in seconds")
+    parser.add_argument("--goals", type=int, default=6, help="goals per synthetic game")
+    parser.add_argument("--clusters", type=int, default=4, help="moments the synthetic goals bunch around")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.05, help="fraction of API requests answered with 503")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="fraction of API requests delayed")
+    parser.add_argument("--slow-delay", type=float, default=2.0, help="delay in seconds for slow API requests")
+    parser.add_argument("--bulbs", type=int, default=2, help="number of fake bulbs")
+    parser.add_argument("--bulb-latency", type=float, default=0.02, help="fake bulb reply delay in seconds")
+    parser.add_argument("--flash-duration", type=float, default=3.0, help="celebration length in seconds")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="show the goal light's own output")
+    run(parser.parse_args())
@@ -0,0 +1,129 @@
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import main
+from bench.run import API_PORT, heavy_night, serve_world
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Directory holding main.py
+
+# Runs the real main() in a fresh interpreter against the fake world, tracking the first game
+DRIVER = """
+import asyncio, sys
+import main
+main.SCHEDULE_CACHE_DIR = sys.argv[1]
+main.BULB_GROUP = main.BulbGroup(sys.argv[2].split(","))
+main.METRICS_FILE = None
+asyncio.run(main.main())
+"""
+
+# Function to measure how long importing main takes
+def import_time(runs):
+    """Return (median milliseconds to import main, heavy modules imported along with it)."""
+    samples = []
+    heavy = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            # Lines look like "import time:       self |  cumulative | module"
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) != 3 or not parts[1].isdigit():
+                continue
+            module = parts[2]
+            if module == "main":
+                samples.append(int(parts[1]) / 1000)
+            elif module.split(".")[0] in ["kasa", "aiohttp", "pytz", "requests"]:
+                heavy.add(module.split(".")[0])
+    return statistics.median(samples), sorted(heavy)
+
+# Function to measure how long a bare interpreter takes to start, for reference
+def interpreter_time(runs):
+    """Return the median milliseconds to start and exit Python with nothing to do."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+# Function to time one launch of the goal light up to "Tracking N games"
+def time_to_tracking(cache_dir, bulb_hosts, timeout=30):
+    """Start the goal light, pick the first game and return the milliseconds until it starts tracking."""
+    env = dict(os.environ, NHL_API_BASE=f"http://127.0.0.1:{API_PORT}/v1", PYTHONUNBUFFERED="1")
+    env.pop("NHL_GOAL_LIGHT_TEAMS", None)
+    env.pop("NHL_GOAL_LIGHT_HUB", None)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", DRIVER, cache_dir, ",".join(bulb_hosts)],
+        cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        process.stdin.write("1\n")
+        process.stdin.flush()
+        for line in process.stdout:
+            if line.startswith("Tracking"):
+                return (time.perf_counter() - started) * 1000
+            if time.perf_counter() - started > timeout:
+                break
+        raise RuntimeError("goal light never started tracking")
+    finally:
+        process.kill()
+        process.wait()
+
+def run(args):
+    """Measure import time and cold and warm start against a fake API and fake bulbs, and print a report."""
+    recording = heavy_night(args.games, duration=3600.0)
+    # Schedules are looked up by the NHL's (Eastern) date
+    recording["schedule"]["gameWeek"][0]["date"] = main.get_todays_date()
+    bulb_hosts = [f"127.0.0.{index + 2}" for index in range(args.bulbs)]
+
+    ready = multiprocessing.Event()
+    world = multiprocessing.Process(
+        target=serve_world,
+        # Every API request is slowed down by the round trip to the real API
+        args=(recording, 1.0, 0.0, 1.0, args.api_latency, bulb_hosts, args.bulb_latency, ready),
+        daemon=True
+    )
+    world.start()
+    try:
+        if not ready.wait(30):
+            sys.exit("Fake world failed to start")
+
+        cold = []
+        warm = []
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                # The first start has no cached schedule; the second one reads it from disk
+                cold.append(time_to_tracking(cache_dir, bulb_hosts))
+                warm.append(time_to_tracking(cache_dir, bulb_hosts))
+    finally:
+        world.terminate()
+        world.join()
+
+    import_ms, heavy = import_time(args.runs)
+    result = {
+        "interpreter_ms": round(interpreter_time(args.runs), 1),
+        "import_main_ms": round(import_ms, 1),
+        "heavy_modules_at_import": heavy,
+        "cold_start_to_tracking_ms": {"median": round(statistics.median(cold), 1), "max": round(max(cold), 1)},
+        "warm_start_to_tracking_ms": {"median": round(statistics.median(warm), 1), "max": round(max(warm), 1)}
+    }
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import time and the time from launch to \"Tracking N games\".")
+    parser.add_argument("--runs", type=int, default=5, help="launches to take the median of")
+    parser.add_argument("--games", type=int, default=16, help="games on the fake schedule")
+    parser.add_argument("--bulbs", type=int, default=2, help="number of fake bulbs")
+    parser.add_argument("--api-latency", type=float, default=0.2, help="fake NHL API reply delay in seconds")
+    parser.add_argument("--bulb-latency", type=float, default=0.1, help="fake bulb reply delay in seconds")
+    run(parser.parse_args())
@@ -1,55 +1,151 @@
 import asyncio
-import requests
-from kasa.iot import IotBulb
+import bisect
+import functools
+import importlib
+import json
+import os
+import random
+import re
+import struct
+from collections import deque, namedtuple
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from zoneinfo import ZoneInfo
 import datetime
-import pytz
 import time
 
+try:
+    import orjson  # Fast JSON decoder for API responses (in requirements.txt; the standard library is used without it)
+except ImportError:
+    orjson = None
+
 # Constants for the bulb IP and settings
-BULB_IP = "BULB IP HERE"  # The IP address of the smart bulb
-CHECK_INTERVAL = 1  # Time interval (in seconds) to check for updates (1 second)
+BULB_IPS = ["BULB IP HERE"]  # The IP addresses of the smart bulbs that celebrate together
+KASA_PORT = 9999  # TCP port Kasa bulbs take commands on
+BULB_RETRY_INTERVAL = 10  # Time (in seconds) to leave a bulb alone after it stops responding
+MAX_LATENCY_COMPENSATION = 0.5  # Most (in seconds) a frame is sent early to make up for a slow bulb
+BULB_TIMEOUT = 5  # Time (in seconds) to wait for a bulb to answer an animation frame
+CHECK_INTERVAL = 1  # Time interval (in seconds) to check for updates during live play (1 second)
+INTERMISSION_INTERVAL = 60  # Longest time (in seconds) between checks during an intermission
+PREGAME_INTERVAL = 10  # Time interval (in seconds) to check for updates shortly before puck drop
+PREGAME_LEAD_TIME = 300  # Start checking this many seconds before the scheduled start
+MAX_CACHE_WAIT = 30  # Longest time (in seconds) we will hold off because the API says the data is still fresh
 FLASH_DURATION = 30  # Duration (in seconds) for which the bulb should flash
+FLASH_INTERVAL = 0.5  # Time (in seconds) each color is shown during a celebration
+FLASH_PATTERN = "toggle"  # Celebration pattern: "toggle", "strobe", "pulse" or "fade"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))  # Directory holding main.py, so data files are found from any working directory
+TEAM_COLORS_FILE = os.path.join(SCRIPT_DIR, "team_colors.json")  # Optional JSON file of custom team colors, e.g. {"TOR": {"primary": [216, 100, 100], "secondary": [0, 0, 100]}}
+MIN_FLASH_DURATION = 5  # Shortest time (in seconds) a celebration runs before a waiting goal takes over
+MAX_GOAL_AGE = 20  # Goals detected longer ago than this (in seconds) are skipped instead of celebrated
+PLAY_BY_PLAY = True  # Read new plays after the score changes to print each goal's scorer and time
 
-# NHL team colors (primary and secondary) in HSV format
-# Format: [Hue (0-360), Saturation (0-100), Value (0-100)]
-TEAM_COLORS = {
-    "ANA": {"primary": [22, 100, 100], "secondary": [0, 0, 0]},       # Orange and Black
-    "ARI": {"primary": [22, 78, 85], "secondary": [202, 100, 57]},    # Brick Red and Desert Sand
-    "BOS": {"primary": [45, 100, 100], "secondary": [0, 0, 0]},       # Gold and Black
-    "BUF": {"primary": [216, 100, 100], "secondary": [45, 100, 100]}, # Blue and Gold
-    "CGY": {"primary": [0, 100, 100], "secondary": [45, 100, 100]},   # Red and Yellow
-    "CAR": {"primary": [0, 100, 100], "secondary": [0, 0, 0]},        # Red and Black
-    "CHI": {"primary": [0, 100, 100], "secondary": [0, 0, 0]},        # Red and Black
-    "COL": {"primary": [215, 86, 83], "secondary": [0, 73, 86]},      # Burgundy and Blue
-    "CBJ": {"primary": [216, 100, 100], "secondary": [0, 100, 100]},  # Blue and Red
-    "DAL": {"primary": [120, 100, 70], "secondary": [0, 0, 20]},      # Green and Black
-    "DET": {"primary": [0, 100, 100], "secondary": [0, 0, 100]},      # Red and White
-    "EDM": {"primary": [216, 100, 100], "secondary": [25, 100, 100]}, # Blue and Orange
-    "FLA": {"primary": [216, 100, 100], "secondary": [0, 100, 100]},  # Blue and Red
-    "LAK": {"primary": [0, 0, 0], "secondary": [270, 3, 62]},         # Black and Silver
-    "MIN": {"primary": [120, 100, 70], "secondary": [0, 100, 100]},   # Green and Red
-    "MTL": {"primary": [0, 100, 100], "secondary": [216, 100, 100]},  # Red and Blue
-    "NSH": {"primary": [45, 100, 100], "secondary": [216, 100, 100]}, # Gold and Blue
-    "NJD": {"primary": [0, 100, 100], "secondary": [0, 0, 0]},        # Red and Black
-    "NYI": {"primary": [216, 100, 100], "secondary": [25, 100, 100]}, # Blue and Orange
-    "NYR": {"primary": [216, 100, 100], "secondary": [0, 100, 100]},  # Blue and Red
-    "OTT": {"primary": [0, 100, 100], "secondary": [0, 0, 0]},        # Red and Black
-    "PHI": {"primary": [25, 100, 100], "secondary": [0, 0, 0]},       # Orange and Black
-    "PIT": {"primary": [0, 0, 0], "secondary": [45, 100, 100]},       # Black and Gold
-    "SJS": {"primary": [180, 100, 70], "secondary": [0, 0, 20]},      # Teal and Black
-    "SEA": {"primary": [180, 100, 70], "secondary": [216, 100, 100]}, # Teal and Blue
-    "STL": {"primary": [216, 100, 100], "secondary": [45, 100, 100]}, # Blue and Gold
-    "TBL": {"primary": [216, 100, 100], "secondary": [0, 0, 100]},    # Blue and White
-    "TOR": {"primary": [216, 100, 100], "secondary": [0, 0, 100]},    # Blue and White
-    "VAN": {"primary": [216, 100, 100], "secondary": [120, 100, 70]}, # Blue and Green
-    "VGK": {"primary": [45, 100, 100], "secondary": [0, 0, 20]},      # Gold and Black
-    "WSH": {"primary": [0, 100, 100], "secondary": [216, 100, 100]},  # Red and Blue
-    "WPG": {"primary": [216, 100, 100], "secondary": [0, 0, 20]},     # Blue and Dark Blue
-    "UTA": {"primary": [0, 0, 0], "secondary": [45, 100, 100]},       # Black and Gold (Utah)
-}
+# Daemon settings: follow teams all season without picking games by hand
+FOLLOW_TEAMS = [team for team in os.environ.get("NHL_GOAL_LIGHT_TEAMS", "").upper().split(",") if team]  # e.g. "TOR,MTL"; empty to pick games interactively
+SCHEDULE_LOOKAHEAD_DAYS = 7  # Days of the schedule (starting today) the daemon looks at for upcoming games
+SCHEDULE_RECHECK_INTERVAL = 6 * 3600  # Longest time (in seconds) the daemon sleeps before checking the schedule for changes
+
+# NHL API settings
+NHL_API_BASE = os.environ.get("NHL_API_BASE", "https://api-web.nhle.com/v1")  # Base URL for all NHL API calls (override to replay a recording)
+HTTP_TIMEOUT = 10  # Timeout (in seconds) for a single NHL API request
+MAX_CONCURRENT_REQUESTS = 4  # Maximum number of NHL API requests in flight at once
+POLL_DEADLINE = 3  # Longest time (in seconds) a score poll may take, hedged requests included
+PLAY_BY_PLAY_DEADLINE = 1  # Longest time (in seconds) a scorer lookup in the play-by-play may take
+HEDGE_PERCENTILE = 0.9  # A second request is sent once the first is slower than this fraction of recent polls
+MIN_HEDGE_DELAY = 0.2  # Shortest wait (in seconds) before sending a hedged request
+MAX_BACKOFF = 30  # Longest wait (in seconds) between polls after repeated failures
+BREAKER_THRESHOLD = 5  # Consecutive failed polls that mark the NHL API as down
+BREAKER_COOLDOWN = 15  # Time (in seconds) to stop polling once the API is marked down, before trying again
+SCHEDULE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nhl-goal-light")  # Where schedules are cached
+SCHEDULE_CACHE_TTL = 12 * 3600  # Cached schedules younger than this (in seconds) are used without waiting for the API
+
+# Hub settings: one machine polls the NHL API and streams events to the goal lights on the others
+HUB_PORT = int(os.environ.get("NHL_GOAL_LIGHT_HUB_PORT", 0)) or None  # Run as a hub serving events on this port instead of driving bulbs (None to disable)
+HUB_URL = os.environ.get("NHL_GOAL_LIGHT_HUB")  # Hub to get events from instead of polling the NHL API, e.g. "http://192.168.1.10:8700"
+HUB_HEARTBEAT_INTERVAL = 15  # Time (in seconds) between keep-alive messages on idle event streams
+HUB_CLIENT_BACKLOG = 1000  # Events buffered for a client before the hub drops it as too slow
+
+# Metrics settings
+METRICS_FILE = os.path.join(SCRIPT_DIR, "goal_light_metrics.json")  # File the metrics are written to periodically (None to disable)
+METRICS_INTERVAL = 60  # Time interval (in seconds) between metrics file dumps
+METRICS_PORT = None  # Local port serving the metrics as JSON at /metrics (None to disable)
+METRICS_SAMPLES = 1000  # Number of recent samples each histogram keeps for percentiles
+
+# Histogram bucket upper bounds for latencies (in seconds) and payload sizes (in bytes)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+# A color in HSV format: Hue (0-360), Saturation (0-100), Value (0-100)
+Color = namedtuple("Color", ["hue", "saturation", "value"])
+
+# A team's celebration colors
+TeamPalette = namedtuple("TeamPalette", ["primary", "secondary"])
+
+# NHL team colors (primary and secondary), read-only
+TEAM_COLORS = MappingProxyType({
+    "ANA": TeamPalette(Color(22, 100, 100), Color(0, 0, 0)),       # Orange and Black
+    "ARI": TeamPalette(Color(22, 78, 85), Color(202, 100, 57)),    # Brick Red and Desert Sand
+    "BOS": TeamPalette(Color(45, 100, 100), Color(0, 0, 0)),       # Gold and Black
+    "BUF": TeamPalette(Color(216, 100, 100), Color(45, 100, 100)), # Blue and Gold
+    "CGY": TeamPalette(Color(0, 100, 100), Color(45, 100, 100)),   # Red and Yellow
+    "CAR": TeamPalette(Color(0, 100, 100), Color(0, 0, 0)),        # Red and Black
+    "CHI": TeamPalette(Color(0, 100, 100), Color(0, 0, 0)),        # Red and Black
+    "COL": TeamPalette(Color(215, 86, 83), Color(0, 73, 86)),      # Burgundy and Blue
+    "CBJ": TeamPalette(Color(216, 100, 100), Color(0, 100, 100)),  # Blue and Red
+    "DAL": TeamPalette(Color(120, 100, 70), Color(0, 0, 20)),      # Green and Black
+    "DET": TeamPalette(Color(0, 100, 100), Color(0, 0, 100)),      # Red and White
+    "EDM": TeamPalette(Color(216, 100, 100), Color(25, 100, 100)), # Blue and Orange
+    "FLA": TeamPalette(Color(216, 100, 100), Color(0, 100, 100)),  # Blue and Red
+    "LAK": TeamPalette(Color(0, 0, 0), Color(270, 3, 62)),         # Black and Silver
+    "MIN": TeamPalette(Color(120, 100, 70), Color(0, 100, 100)),   # Green and Red
+    "MTL": TeamPalette(Color(0, 100, 100), Color(216, 100, 100)),  # Red and Blue
+    "NSH": TeamPalette(Color(45, 100, 100), Color(216, 100, 100)), # Gold and Blue
+    "NJD": TeamPalette(Color(0, 100, 100), Color(0, 0, 0)),        # Red and Black
+    "NYI": TeamPalette(Color(216, 100, 100), Color(25, 100, 100)), # Blue and Orange
+    "NYR": TeamPalette(Color(216, 100, 100), Color(0, 100, 100)),  # Blue and Red
+    "OTT": TeamPalette(Color(0, 100, 100), Color(0, 0, 0)),        # Red and Black
+    "PHI": TeamPalette(Color(25, 100, 100), Color(0, 0, 0)),       # Orange and Black
+    "PIT": TeamPalette(Color(0, 0, 0), Color(45, 100, 100)),       # Black and Gold
+    "SJS": TeamPalette(Color(180, 100, 70), Color(0, 0, 20)),      # Teal and Black
+    "SEA": TeamPalette(Color(180, 100, 70), Color(216, 100, 100)), # Teal and Blue
+    "STL": TeamPalette(Color(216, 100, 100), Color(45, 100, 100)), # Blue and Gold
+    "TBL": TeamPalette(Color(216, 100, 100), Color(0, 0, 100)),    # Blue and White
+    "TOR": TeamPalette(Color(216, 100, 100), Color(0, 0, 100)),    # Blue and White
+    "VAN": TeamPalette(Color(216, 100, 100), Color(120, 100, 70)), # Blue and Green
+    "VGK": TeamPalette(Color(45, 100, 100), Color(0, 0, 20)),      # Gold and Black
+    "WSH": TeamPalette(Color(0, 100, 100), Color(216, 100, 100)),  # Red and Blue
+    "WPG": TeamPalette(Color(216, 100, 100), Color(0, 0, 20)),     # Blue and Dark Blue
+    "UTA": TeamPalette(Color(0, 0, 0), Color(45, 100, 100)),       # Black and Gold (Utah)
+})
+
+# Color used for teams we don't have colors for (primary and secondary)
+DEFAULT_TEAM_COLORS = TeamPalette(Color(0, 100, 100), Color(0, 0, 100))
+
+# Team colors in use: TEAM_COLORS plus any custom colors from TEAM_COLORS_FILE (see load_team_palettes)
+TEAM_PALETTES = TEAM_COLORS
+
+# Brightness used for the dark half of a strobe and the low point of a pulse
+STROBE_DARK_VALUE = 1
+PULSE_LOW_VALUE = 20
 
-# Global variable to store the original bulb state
-ORIGINAL_BULB_STATE = {
+# A single animation frame: when to send it (seconds after the celebration starts), what to show
+# and the encrypted command bytes that show it
+Frame = namedtuple("Frame", ["offset", "hue", "saturation", "value", "transition", "payload"])
+
+# Kasa service that takes light state changes
+LIGHT_SERVICE = "smartlife.iot.smartbulb.lightingservice"
+
+# The few fields the monitors need from a game, pulled out of each score feed or boxscore poll
+GameSnapshot = namedtuple(
+    "GameSnapshot",
+    ["away_team", "home_team", "game_state", "away_score", "home_score", "api_updated_at"],
+    defaults=[None]
+)
+
+# Top-level boxscore key that starts the (large) per-player stats; decoding stops before it
+BOXSCORE_STOP_KEY = b'"playerByGameStats"'
+
+# State each bulb is restored to if its original state couldn't be captured (plain white)
+DEFAULT_BULB_STATE = {
     "on": True,
     "brightness": 100,
     "color_temp": None,
@@ -58,34 +154,475 @@ ORIGINAL_BULB_STATE = {
     "color_mode": None
 }
 
+# Histogram of one measurement
+class Histogram:
+    """Bucketed histogram that also keeps the most recent samples for percentiles."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # Last bucket counts everything above the largest bound
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.recent = deque(maxlen=METRICS_SAMPLES)
+
+    def observe(self, value):
+        """Record one sample."""
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.recent.append(value)
+
+    def percentile(self, fraction, recent=None):
+        """Return a percentile of the recent samples (None if there are none)."""
+        recent = sorted(self.recent) if recent is None else recent
+        return recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else None
+
+    def to_dict(self):
+        """Summarize the histogram for export."""
+        recent = sorted(self.recent)
+        percentiles = {}
+        for name, fraction in [("p50", 0.5), ("p90", 0.9), ("p99", 0.99)]:
+            percentiles[name] = self.percentile(fraction, recent)
+        
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.buckets)}
+        buckets["le_inf"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            **percentiles,
+            "buckets": buckets
+        }
+
+# Latency, size and error metrics grouped by scope (a game, a bulb or an API endpoint)
+class Metrics:
+    """Collect histograms and counters for the whole goal-to-light path."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.histograms = {}  # scope -> name -> Histogram
+        self.counters = {}  # scope -> name -> count
+
+    def observe(self, scope, name, value, bounds=LATENCY_BUCKETS):
+        """Record a sample in a scope's histogram."""
+        histograms = self.histograms.setdefault(str(scope), {})
+        if name not in histograms:
+            histograms[name] = Histogram(bounds)
+        histograms[name].observe(value)
+
+    def count(self, scope, name, amount=1):
+        """Increment a scope's counter."""
+        counters = self.counters.setdefault(str(scope), {})
+        counters[name] = counters.get(name, 0) + amount
+
+    def histogram(self, scope, name):
+        """Return a scope's histogram, or None if nothing was recorded yet."""
+        return self.histograms.get(str(scope), {}).get(name)
+
+    def snapshot(self):
+        """Return every metric as a JSON-friendly dict."""
+        scopes = {}
+        for scope in sorted(set(self.histograms) | set(self.counters)):
+            scopes[scope] = {
+                "histograms": {name: h.to_dict() for name, h in self.histograms.get(scope, {}).items()},
+                "counters": dict(self.counters.get(scope, {}))
+            }
+        return {
+            "generated_at": time.time(),
+            "uptime": time.time() - self.started_at,
+            "scopes": scopes
+        }
+
+    def write(self, path):
+        """Dump a snapshot to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+# Shared metrics for the whole program
+METRICS = Metrics()
+
+# Function to periodically write metrics to disk
+async def metrics_writer():
+    """Write the metrics file every METRICS_INTERVAL seconds, and once more when cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            METRICS.write(METRICS_FILE)
+    finally:
+        METRICS.write(METRICS_FILE)
+
+# Function to serve metrics over local HTTP
+async def start_metrics_server():
+    """Serve the metrics as JSON at http://127.0.0.1:METRICS_PORT/metrics; returns the runner to clean up."""
+    from aiohttp import web
+    
+    async def handle_metrics(request):
+        return web.json_response(METRICS.snapshot())
+    
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", METRICS_PORT).start()
+    print(f"Serving metrics at http://127.0.0.1:{METRICS_PORT}/metrics")
+    return runner
+
+# Shared HTTP session used for every NHL API call (created on first use)
+HTTP_SESSION = None
+
+def get_http_session():
+    """Return the shared NHL API session, creating it if needed."""
+    global HTTP_SESSION
+
+    if HTTP_SESSION is None or HTTP_SESSION.closed:
+        import aiohttp
+        
+        # Keep connections alive between polls so each request reuses the same TLS connection,
+        # and cap the pool size so a burst of polls queues instead of opening new sockets
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONCURRENT_REQUESTS,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        HTTP_SESSION = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+    return HTTP_SESSION
+
+async def close_http_session():
+    """Close the shared NHL API session."""
+    global HTTP_SESSION
+
+    if HTTP_SESSION is not None and not HTTP_SESSION.closed:
+        await HTTP_SESSION.close()
+    HTTP_SESSION = None
+
+# Function to decode an API response body
+def decode_json(body):
+    """Decode JSON bytes, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+# Function to decode only the part of a boxscore before the per-player stats
+def decode_boxscore(body):
+    """Decode a boxscore without its playerByGameStats and everything after it.
+
+    Falls back to decoding the whole body if the cut doesn't leave valid JSON with both teams.
+    """
+    cut = body.find(BOXSCORE_STOP_KEY)
+    if cut > 0:
+        head = body[:cut].rstrip()
+        if head.endswith(b","):
+            try:
+                data = decode_json(head[:-1] + b"}")
+                if "awayTeam" in data and "homeTeam" in data:
+                    return data
+            except ValueError:
+                pass
+    return decode_json(body)
+
+# Function to make a request to the NHL API without blocking the event loop
+async def request_json(url, scope="api", headers=None, decode=decode_json):
+    """Fetch a URL with the shared session and return (status, decoded JSON or None if not 200 OK, response headers).
+
+    Round trip time, payload size and errors are recorded under the given metrics scope.
+    """
+    session = get_http_session()
+    loop = asyncio.get_running_loop()
+    sent_at = loop.time()
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                if response.status != 304:
+                    METRICS.count(scope, "http_errors")
+                return response.status, None, response.headers
+            body = await response.read()
+    except Exception:
+        METRICS.count(scope, "request_errors")
+        raise
+    
+    METRICS.observe(scope, "poll_rtt", loop.time() - sent_at)
+    METRICS.observe(scope, "payload_bytes", len(body), SIZE_BUCKETS)
+    return response.status, decode(body), response.headers
+
+# Raised instead of polling while the NHL API is marked down
+class CircuitOpenError(Exception):
+    """The circuit breaker is open, so the request wasn't sent."""
+
+# Guard that stops hammering the NHL API while it is down
+class CircuitBreaker:
+    """Open after BREAKER_THRESHOLD consecutive failures, refuse requests for BREAKER_COOLDOWN seconds,
+    then let a trial request through (half-open) and close again on the first success.
+    """
+
+    def __init__(self, name, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0  # Consecutive failures
+        self.open_until = None  # Loop time until which requests are refused, None while closed
+        self.opened_at = None  # Loop time the current outage started
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        return self.open_until is None or asyncio.get_running_loop().time() >= self.open_until
+
+    def record_success(self):
+        """Close the breaker after a successful request."""
+        if self.opened_at is not None:
+            outage = asyncio.get_running_loop().time() - self.opened_at
+            print(f"{self.name} is responding again (down for {outage:.0f}s)")
+            METRICS.observe("api", "outage_seconds", outage)
+        self.failures = 0
+        self.open_until = None
+        self.opened_at = None
+
+    def record_failure(self, error):
+        """Count a failed request, opening (or re-opening) the breaker once there are too many in a row."""
+        self.failures += 1
+        if self.failures < self.threshold:
+            return
+        now = asyncio.get_running_loop().time()
+        if self.opened_at is None:
+            print(f"{self.name} is not responding ({self.failures} failed requests in a row: {error}); "
+                  f"pausing polls for {self.cooldown}s at a time until it recovers")
+            METRICS.count("api", "breaker_opened")
+            self.opened_at = now
+        self.open_until = now + self.cooldown
+
+# Circuit breaker shared by every live poll of the NHL API
+API_BREAKER = CircuitBreaker("NHL API")
+
+def hedge_delay(scope, deadline=POLL_DEADLINE):
+    """Return how long to wait for a request before hedging it, from the scope's recent round trip times.
+
+    Never later than halfway to the deadline, so the hedged request still has time to answer.
+    """
+    histogram = METRICS.histogram(scope, "poll_rtt")
+    threshold = histogram.percentile(HEDGE_PERCENTILE) if histogram is not None else None
+    if threshold is None:
+        return deadline / 2
+    return min(max(MIN_HEDGE_DELAY, threshold), deadline / 2)
+
+# Function to make a latency-critical poll of the NHL API
+async def poll_json(url, scope="api", decode=decode_json, deadline=POLL_DEADLINE):
+    """Fetch a URL for a live poll and return (status, decoded JSON or None if not 200 OK, response headers).
+
+    A second (hedged) request is sent if the first is slower than usual or fails, the first good answer wins,
+    and the whole poll gives up after deadline seconds. Raises on failure, or CircuitOpenError while the API is down.
+    """
+    import aiohttp
+    
+    if not API_BREAKER.allow():
+        raise CircuitOpenError(f"{API_BREAKER.name} is marked down")
+    
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + deadline
+    attempts = {asyncio.create_task(request_json(url, scope, decode=decode))}
+    hedge_at = loop.time() + hedge_delay(scope, deadline)
+    hedged = False
+    error = None
+    try:
+        while attempts:
+            # Wait for an answer, but no longer than the hedge point (until we've hedged) or the deadline
+            wait_until = give_up_at if hedged else min(hedge_at, give_up_at)
+            done, attempts = await asyncio.wait(attempts, timeout=max(0, wait_until - loop.time()), return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                try:
+                    status, data, headers = attempt.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if status < 500:
+                    API_BREAKER.record_success()
+                    return status, data, headers
+                error = aiohttp.ClientError(f"HTTP {status}")
+            
+            if loop.time() >= give_up_at:
+                METRICS.count(scope, "deadline_exceeded")
+                error = asyncio.TimeoutError(f"no answer within {deadline}s")
+                break
+            # Hedge once: when the first request is slow, or right away if it already failed
+            if not hedged and (attempts or done):
+                hedged = True
+                METRICS.count(scope, "hedged_requests")
+                attempts.add(asyncio.create_task(request_json(url, scope, decode=decode)))
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+    
+    API_BREAKER.record_failure(error)
+    raise error
+
+def api_updated_at(headers):
+    """Return when the API produced a response (Unix time), from Last-Modified or else Date minus Age."""
+    try:
+        if "Last-Modified" in headers:
+            return parsedate_to_datetime(headers["Last-Modified"]).timestamp()
+        if "Date" in headers:
+            age = headers.get("Age", "0")
+            return parsedate_to_datetime(headers["Date"]).timestamp() - (int(age) if age.isdigit() else 0)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def cache_freshness(headers):
+    """Return how many more seconds a response stays fresh according to its Cache-Control/Age headers."""
+    max_age = None
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age" and value.isdigit():
+            max_age = int(value)
+    if max_age is None:
+        return 0
+    
+    age = headers.get("Age", "0")
+    age = int(age) if age.isdigit() else 0
+    return max(0, min(max_age - age, MAX_CACHE_WAIT))
+
 def get_todays_date():
     """Get today's date in the format required by the NHL API (YYYY-MM-DD)."""
     # Use Eastern Time since that's what NHL typically uses for scheduling
-    eastern = pytz.timezone('US/Eastern')
-    today = datetime.datetime.now(eastern)
+    today = datetime.datetime.now(ZoneInfo("America/New_York"))
     return today.strftime("%Y-%m-%d")
 
-def fetch_todays_games():
-    """Fetch the list of today's NHL games."""
-    today = get_todays_date()
-    schedule_url = f"https://api-web.nhle.com/v1/schedule/{today}"
+# Background revalidation of the cached schedule, started by fetch_todays_games
+SCHEDULE_REFRESH_TASK = None
+
+def schedule_cache_path(date):
+    """Return the cache file for one day's schedule."""
+    return os.path.join(SCHEDULE_CACHE_DIR, f"schedule-{date}.json")
+
+def read_cached_schedule(date):
+    """Return the cached schedule entry for a date, or None if there isn't a usable one."""
+    try:
+        with open(schedule_cache_path(date)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_schedule_cache(data, source_date, headers):
+    """Cache every day of a schedule response, so one request warms the whole week."""
+    entry = {
+        "fetched_at": time.time(),
+        "source_date": source_date,  # The date we requested; its validators cover the whole response
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified")
+    }
+    try:
+        os.makedirs(SCHEDULE_CACHE_DIR, exist_ok=True)
+        for day in data.get("gameWeek", []):
+            path = schedule_cache_path(day["date"])
+            # Write to a temporary file first so a crash never leaves a half-written cache
+            with open(path + ".tmp", "w") as f:
+                json.dump(dict(entry, games=day.get("games", [])), f)
+            os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Warning: couldn't write schedule cache: {e}")
+
+def touch_schedule_cache(cached):
+    """Mark a cached schedule as fresh again after the API confirmed it hasn't changed."""
+    cached["fetched_at"] = time.time()
+    try:
+        with open(schedule_cache_path(cached["date"]) + ".tmp", "w") as f:
+            json.dump({key: value for key, value in cached.items() if key != "date"}, f)
+        os.replace(schedule_cache_path(cached["date"]) + ".tmp", schedule_cache_path(cached["date"]))
+    except OSError:
+        pass
+
+async def refresh_schedule(date, cached=None):
+    """Fetch a day's schedule, revalidating the cached copy with ETag/Last-Modified; returns its games.
+
+    Returns None if the request failed.
+    """
+    source_date = cached["source_date"] if cached else date
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    
+    status, data, response_headers = await request_json(f"{NHL_API_BASE}/schedule/{source_date}", "schedule", headers)
+    if status == 304 and cached:
+        touch_schedule_cache(dict(cached, date=date))
+        return cached["games"]
+    if data is None:
+        return None
     
+    write_schedule_cache(data, source_date, response_headers)
+    for day in data.get("gameWeek", []):
+        if day["date"] == date:
+            return day.get("games", [])
+    return []
+
+async def revalidate_schedule(date, cached):
+    """Refresh the cached schedule in the background, quietly."""
     try:
-        response = requests.get(schedule_url)
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Check if there are games today
-            if "gameWeek" in data and data["gameWeek"]:
-                for day in data["gameWeek"]:
-                    if day["date"] == today and "games" in day:
-                        return day["games"]
-            
-            print(f"No games scheduled for today ({today})")
-            return []
+        # Import the HTTP client off the event loop, since nothing is waiting for this answer
+        await asyncio.to_thread(importlib.import_module, "aiohttp")
+        await refresh_schedule(date, cached)
+    except Exception:
+        pass
+
+async def fetch_games(date, revalidate=True):
+    """Fetch the list of NHL games on a date, answering from the on-disk cache when it's fresh.
+
+    A fresh cached answer is revalidated in the background unless revalidate is False.
+    Returns None if the schedule couldn't be fetched and isn't cached.
+    """
+    global SCHEDULE_REFRESH_TASK
+    
+    cached = read_cached_schedule(date)
+    
+    # Use a fresh cached schedule right away and check it against the API in the background
+    if cached and time.time() - cached["fetched_at"] < SCHEDULE_CACHE_TTL:
+        if revalidate:
+            SCHEDULE_REFRESH_TASK = asyncio.create_task(revalidate_schedule(date, cached))
+        return cached["games"]
+    
+    try:
+        games = await refresh_schedule(date, cached)
     except Exception as e:
-        print(f"Error fetching today's games: {e}")
-        return []
+        print(f"Error fetching games for {date}: {e}")
+        games = None
+    
+    if games is None:
+        if not cached:
+            print(f"Error fetching games for {date}: schedule request failed")
+            return None
+        print("Warning: couldn't reach the NHL API, using the cached schedule")
+        games = cached["games"]
+    return games
+
+async def fetch_todays_games():
+    """Fetch the list of today's NHL games."""
+    today = get_todays_date()
+    games = await fetch_games(today) or []
+    if not games:
+        print(f"No games scheduled for today ({today})")
+    return games
+
+# Function to turn a schedule entry into the game info a monitor needs
+def parse_utc_time(text):
+    """Parse an API timestamp such as "2025-01-15T00:00:00Z" into an aware UTC datetime."""
+    return datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+def get_game_info(game, game_date=None):
+    """Return the ID, team abbreviations, start time (UTC datetime) and date of a scheduled game."""
+    return {
+        "id": game["id"],
+        "start_time_utc": parse_utc_time(game["startTimeUTC"]),
+        "away_team": game["awayTeam"]["abbrev"],
+        "home_team": game["homeTeam"]["abbrev"],
+        "game_date": game.get("gameDate", game_date or get_todays_date())
+    }
 
 def display_game_options(games):
     """Display the available games and let the user select multiple games."""
@@ -96,15 +633,15 @@ def display_game_options(games):
     print("\nToday's NHL Games:")
     print("------------------")
     
-    for i, game in enumerate(games, 1):
+    # Parse each game's start time once, for both the list and the selection
+    game_infos = [get_game_info(game) for game in games]
+    
+    for i, (game, game_info) in enumerate(zip(games, game_infos), 1):
         away_team = game["awayTeam"]["placeName"]["default"] + " " + game["awayTeam"]["commonName"]["default"]
         home_team = game["homeTeam"]["placeName"]["default"] + " " + game["homeTeam"]["commonName"]["default"]
         
         # Convert UTC time to local time
-        start_time_utc = datetime.datetime.strptime(game["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ")
-        start_time_utc = pytz.utc.localize(start_time_utc)
-        local_tz = datetime.datetime.now().astimezone().tzinfo
-        start_time_local = start_time_utc.astimezone(local_tz)
+        start_time_local = game_info["start_time_utc"].astimezone()
         
         # Format the time
         time_str = start_time_local.strftime("%I:%M %p")
@@ -137,28 +674,14 @@ def display_game_options(games):
                 continue
                 
             for game_num in valid_selections:
-                game_id = games[game_num - 1]["id"]
-                start_time_utc = games[game_num - 1]["startTimeUTC"]
-                away_team = games[game_num - 1]["awayTeam"]["abbrev"]
-                home_team = games[game_num - 1]["homeTeam"]["abbrev"]
-                
-                # Parse the UTC time
-                start_time = datetime.datetime.strptime(start_time_utc, "%Y-%m-%dT%H:%M:%SZ")
-                start_time = pytz.utc.localize(start_time)
-                
-                selected_games.append({
-                    "id": game_id,
-                    "start_time_utc": start_time,
-                    "away_team": away_team,
-                    "home_team": home_team
-                })
+                game_info = game_infos[game_num - 1]
+                selected_games.append(game_info)
                 
                 # Convert to local time for display
-                local_tz = datetime.datetime.now().astimezone().tzinfo
-                local_start = start_time.astimezone(local_tz)
+                local_start = game_info["start_time_utc"].astimezone()
                 time_str = local_start.strftime("%I:%M %p")
                 
-                print(f"Added: {away_team} @ {home_team} [{time_str}]")
+                print(f"Added: {game_info['away_team']} @ {game_info['home_team']} [{time_str}]")
             
             # Selection complete, exit loop
             break
@@ -168,29 +691,69 @@ def display_game_options(games):
     
     return selected_games
 
-# Function to capture the original bulb state
-async def capture_original_bulb_state():
-    """Capture the complete original state of the bulb."""
-    global ORIGINAL_BULB_STATE
-    
-    try:
-        # Connect to the bulb
-        bulb = IotBulb(BULB_IP)
-        await bulb.update()
-        
-        # Store if the bulb is on
-        ORIGINAL_BULB_STATE["on"] = bulb.is_on
+# Long-lived connection to the smart bulb
+class BulbSession:
+    """Own the connection to a bulb, keep a cached copy of its state and reconnect on failure."""
+
+    def __init__(self, host):
+        self.host = host
+        self.bulb = None  # IotBulb, created on first connect
+        self.connected = False
+        self.state = {}  # Cached bulb state, updated on connect and after every command we send
+        self.original_state = dict(DEFAULT_BULB_STATE)  # State to restore after a celebration
+        self.latency = None  # Smoothed command round trip time (in seconds), None until measured
+        self.offline = False  # True after the bulb stopped responding, until a command succeeds again
+        self.retry_at = 0  # Loop time before which animation frames skip this bulb
+        self.frame_reader = None  # Connection animation frames are written to, opened on first use
+        self.frame_writer = None
+        self.command_lock = asyncio.Lock()  # Keeps commands in order across both connections
+        self.restore_pending = False  # True while the bulb still shows a celebration the last restore couldn't undo
+
+    async def connect(self):
+        """Connect to the bulb and refresh the cached state from the device."""
+        if self.bulb is None:
+            from kasa.iot import IotBulb
+            self.bulb = IotBulb(self.host)
+        await self.bulb.update()
+        self.connected = True
+        self.read_state()
+
+    async def ensure_connected(self):
+        """Connect only if we don't already have a working connection."""
+        if not self.connected:
+            await self.connect()
+
+    async def reset(self):
+        """Drop the connection so the next command reconnects from scratch."""
+        bulb = self.bulb
+        self.bulb = None
+        self.connected = False
+        if self.frame_writer is not None:
+            self.frame_writer.close()
+            self.frame_reader = self.frame_writer = None
+        if bulb is not None:
+            try:
+                await bulb.disconnect()
+            except Exception:
+                pass
+
+    def read_state(self):
+        """Copy the state reported by the last device update into the cached state."""
+        state = {
+            "on": self.bulb.is_on,
+            "brightness": 100,
+            "color_temp": None,
+            "hue": 0,
+            "saturation": 0,
+            "color_mode": None
+        }
         
         # Get the light module
-        light = bulb.modules["Light"]
+        light = self.bulb.modules["Light"]
         
         # Store brightness
         if hasattr(light, "brightness"):
-            ORIGINAL_BULB_STATE["brightness"] = light.brightness
-        
-        # Check color mode and store relevant values
-        if hasattr(light, "color_mode"):
-            ORIGINAL_BULB_STATE["color_mode"] = light.color_mode
+            state["brightness"] = light.brightness
         
         # Store HSV values using the namedtuple-style access
         if hasattr(light, "hsv"):
@@ -198,184 +761,1001 @@ async def capture_original_bulb_state():
             # Handle HSV regardless of whether it's a namedtuple, object, or regular tuple
             try:
                 # Try accessing by attribute names (namedtuple or object style)
-                ORIGINAL_BULB_STATE["hue"] = hsv_obj.hue
-                ORIGINAL_BULB_STATE["saturation"] = hsv_obj.saturation
-                ORIGINAL_BULB_STATE["brightness"] = hsv_obj.value
+                state["hue"] = hsv_obj.hue
+                state["saturation"] = hsv_obj.saturation
+                state["brightness"] = hsv_obj.value
             except AttributeError:
                 # Fall back to index-based access if attribute access fails
                 if len(hsv_obj) >= 3:
-                    ORIGINAL_BULB_STATE["hue"] = hsv_obj[0]
-                    ORIGINAL_BULB_STATE["saturation"] = hsv_obj[1]
-                    ORIGINAL_BULB_STATE["brightness"] = hsv_obj[2]
+                    state["hue"] = hsv_obj[0]
+                    state["saturation"] = hsv_obj[1]
+                    state["brightness"] = hsv_obj[2]
         
-        # Store color temperature if in that mode
-        if hasattr(light, "color_temp") and light.color_temp:
-            ORIGINAL_BULB_STATE["color_temp"] = light.color_temp
+        # Store color temperature if in that mode (a non-zero temperature means the bulb is in white mode)
+        try:
+            if light.color_temp:
+                state["color_temp"] = light.color_temp
+                state["color_mode"] = "color_temp"
+            else:
+                state["color_mode"] = "hsv"
+        except Exception:
+            state["color_mode"] = "hsv"
         
-        return True
-    except Exception as e:
-        print(f"Error capturing original bulb state: {e}")
-        # Print detailed stack trace to help debug
-        import traceback
-        traceback.print_exc()
-        return False
+        self.state = state
 
-# Function to restore the original bulb state
-async def restore_original_bulb_state():
-    """Restore the bulb to its original state."""
-    try:
-        # Connect to the bulb
-        bulb = IotBulb(BULB_IP)
-        await bulb.update()
+    async def send(self, command, state_change):
+        """Run a command against the bulb, reconnecting and retrying once if the connection has gone bad.
+
+        On success the cached state is updated with state_change instead of querying the device again.
+        """
+        loop = asyncio.get_running_loop()
+        async with self.command_lock:
+            for attempt in range(2):
+                try:
+                    await self.ensure_connected()
+                    sent_at = loop.time()
+                    await command(self.bulb)
+                    self.record_latency(loop.time() - sent_at)
+                    self.state.update(state_change)
+                    if self.offline:
+                        print(f"Bulb {self.host} is responding again")
+                        self.offline = False
+                    return
+                except Exception as e:
+                    await self.reset()
+                    if attempt:
+                        self.mark_offline(e)
+                        raise
+
+    async def write_payload(self, payload):
+        """Write ready-made request bytes on the frame connection and wait for the bulb's reply (not decoded)."""
+        if self.frame_writer is None:
+            self.frame_reader, self.frame_writer = await asyncio.open_connection(self.host, KASA_PORT)
+        self.frame_writer.write(payload)
+        (length,) = struct.unpack(">I", await self.frame_reader.readexactly(4))
+        await self.frame_reader.readexactly(length)
+
+    def available(self):
+        """Return False while a bulb that stopped responding is being left alone."""
+        return asyncio.get_running_loop().time() >= self.retry_at
+
+    def mark_offline(self, error):
+        """Report that the bulb stopped responding (once) and leave it alone for BULB_RETRY_INTERVAL."""
+        if not self.offline:
+            print(f"Bulb {self.host} is not responding: {error}")
+            self.offline = True
+        self.retry_at = asyncio.get_running_loop().time() + BULB_RETRY_INTERVAL
+
+    def record_latency(self, round_trip):
+        """Fold a command round trip time into the smoothed latency estimate."""
+        METRICS.observe(f"bulb {self.host}", "bulb_rtt", round_trip)
+        if self.latency is None:
+            self.latency = round_trip
+        else:
+            self.latency = 0.8 * self.latency + 0.2 * round_trip
+
+    async def capture(self):
+        """Connect and remember the bulb's current state so it can be restored later."""
+        await self.connect()
+        self.original_state = dict(self.state)
+
+    def restore_command(self):
+        """Work out the single light state command that takes the bulb from its cached state back to its original one.
+
+        Returns (command fields, cached state change); both are empty if nothing differs.
+        """
+        original = self.original_state
+        current = self.state
         
-        # Get the light module
-        light = bulb.modules["Light"]
+        # Fast path: the bulb was off, so turning it off is all that's needed (its color doesn't show)
+        if not original["on"]:
+            if current.get("on") is False:
+                return {}, {}
+            return {"on_off": 0}, {"on": False}
         
-        # Restore color state based on original color mode
-        if ORIGINAL_BULB_STATE["color_mode"] == "color_temp" and ORIGINAL_BULB_STATE["color_temp"]:
-            # Restore color temperature
-            await light.set_color_temp(ORIGINAL_BULB_STATE["color_temp"], transition=100)
+        command = {}
+        state_change = {}
+        if original["color_mode"] == "color_temp" and original["color_temp"]:
+            if current.get("color_mode") != "color_temp" or current.get("color_temp") != original["color_temp"]:
+                command["color_temp"] = original["color_temp"]
+                state_change.update(color_temp=original["color_temp"], color_mode="color_temp")
         else:
-            # Restore HSV
-            await light.set_hsv(
-                ORIGINAL_BULB_STATE["hue"],
-                ORIGINAL_BULB_STATE["saturation"],
-                ORIGINAL_BULB_STATE["brightness"] if ORIGINAL_BULB_STATE["brightness"] else 100,
-                transition=100
-            )
+            for field in ["hue", "saturation"]:
+                if current.get("color_mode") != "hsv" or current.get(field) != original[field]:
+                    command[field] = original[field]
+                    state_change[field] = original[field]
+            if command:
+                command["color_temp"] = 0  # Leave white mode
+                state_change.update(color_temp=None, color_mode="hsv")
         
-        # Restore on/off state (do this last)
-        if ORIGINAL_BULB_STATE["on"]:
-            await bulb.turn_on()
-        else:
-            await bulb.turn_off()
-            
+        brightness = original["brightness"] if original["brightness"] else 100
+        if current.get("brightness") != brightness:
+            command["brightness"] = brightness
+            state_change["brightness"] = brightness
+        
+        if command or not current.get("on"):
+            command["on_off"] = 1
+            # Without color fields, let the bulb come back on in its own last state
+            command["ignore_default"] = 1 if len(command) > 1 else 0
+            state_change["on"] = True
+        return command, state_change
+
+    async def restore(self):
+        """Put the bulb back into its original state, sending only what differs in one command (or none)."""
+        command, state_change = self.restore_command()
+        if command:
+            command["transition_period"] = 100
+            await self.send_payload(encode_light_state(command), state_change)
+
+    async def send_payload(self, payload, state_change):
+        """Send ready-made command bytes to the bulb."""
+        await self.send(lambda bulb: asyncio.wait_for(self.write_payload(payload), BULB_TIMEOUT), state_change)
+
+    async def show_frame(self, frame):
+        """Show an animation frame by sending its precompiled bytes."""
+        await self.send_payload(
+            frame.payload,
+            {"on": True, "hue": frame.hue, "saturation": frame.saturation, "brightness": frame.value,
+             "color_temp": None, "color_mode": "hsv"}
+        )
+
+# All the bulbs that celebrate together
+class BulbGroup:
+    """A set of bulb sessions driven in parallel so one slow or offline bulb never holds up the others."""
+
+    def __init__(self, hosts):
+        self.sessions = [BulbSession(host) for host in hosts]
+
+    def send_leads(self):
+        """Return how early (in seconds) to send each bulb's frames so they all change at the same moment.
+
+        Each bulb is sent its frames ahead of time by its estimated one-way latency (half its round trip).
+        """
+        leads = []
+        for session in self.sessions:
+            if session.latency is None:
+                leads.append(0)
+            else:
+                leads.append(min(session.latency / 2, MAX_LATENCY_COMPENSATION))
+        return leads
+
+# Shared group of bulbs, connected when we capture their original state
+BULB_GROUP = BulbGroup(BULB_IPS)
+
+# Function to run a capture or restore on one bulb without letting it hold up the others
+async def within_bulb_timeout(session, action):
+    """Run action() for a bulb, giving up after BULB_TIMEOUT (one try, no reconnecting) and leaving the bulb alone if it fails."""
+    try:
+        await asyncio.wait_for(action(), BULB_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Drop the connection too, since a command may have been cut off halfway
+        await session.reset()
+        session.mark_offline(f"no answer within {BULB_TIMEOUT}s")
+        raise asyncio.TimeoutError(f"no answer within {BULB_TIMEOUT}s")
+    except Exception as e:
+        session.mark_offline(e)
+        raise
+
+# Function to capture the original bulb state
+async def capture_original_bulb_state():
+    """Capture the complete original state of every bulb."""
+    # Import the bulb library off the event loop so it overlaps whatever else is starting up
+    await asyncio.to_thread(importlib.import_module, "kasa.iot")
+    results = await asyncio.gather(
+        *(within_bulb_timeout(session, session.capture) for session in BULB_GROUP.sessions),
+        return_exceptions=True
+    )
+    
+    success = True
+    for session, result in zip(BULB_GROUP.sessions, results):
+        if isinstance(result, Exception):
+            print(f"Error capturing original state of bulb {session.host}: {result}")
+            success = False
+    if not success:
+        print("Warning: Failed to capture the original state of some bulbs. Default white will be used after flashing.")
+    return success
+
+# Function to restore the original bulb state
+async def restore_original_bulb_state(every_bulb=False):
+    """Restore every bulb to its original state.
+
+    Unless every_bulb is set (on shutdown), bulbs that are being left alone after they stopped responding
+    are skipped; they and any bulb whose restore fails are marked restore_pending for a later retry.
+    """
+    if every_bulb:
+        sessions = list(BULB_GROUP.sessions)
+    else:
+        sessions = [session for session in BULB_GROUP.sessions if session.available()]
+    for session in BULB_GROUP.sessions:
+        session.restore_pending = session not in sessions
+    
+    was_offline = [session.offline for session in sessions]
+    results = await asyncio.gather(
+        *(within_bulb_timeout(session, session.restore) for session in sessions),
+        return_exceptions=True
+    )
+    
+    success = len(sessions) == len(BULB_GROUP.sessions)
+    for session, result, offline in zip(sessions, results, was_offline):
+        if isinstance(result, Exception):
+            session.restore_pending = True
+            # Bulbs already known to be offline are retried quietly
+            if not offline:
+                print(f"Error restoring state of bulb {session.host}: {result}")
+            success = False
+    return success
+
+def restore_retry_delay():
+    """Return how long (in seconds) until a bulb the last restore couldn't reach may be tried again, None if there's none."""
+    due = [session.retry_at for session in BULB_GROUP.sessions if session.restore_pending]
+    if not due:
+        return None
+    return max(0, min(due) - asyncio.get_running_loop().time())
+
+# Function to show one animation frame on a bulb
+async def set_bulb_color(session, frame):
+    """Show a frame on the bulb; returns False if the bulb didn't take it."""
+    try:
+        await session.show_frame(frame)
         return True
     except Exception as e:
-        print(f"Error restoring bulb state: {e}")
+        # Bulbs that stop responding are reported once by the session
+        if not session.offline:
+            print(f"Error setting bulb color: {e}")
         return False
 
-# Function to set the bulb color using the new API
-async def set_bulb_color(bulb, hue, saturation, value):
-    """Set the bulb color using the new API to avoid deprecation warnings."""
-    try:
-        # Get the light module
-        light = bulb.modules["Light"]
+# Function to check a custom color from the team colors file
+def parse_color(hsv):
+    """Turn a [hue, saturation, value] list into a Color, raising ValueError if it isn't a valid HSV color."""
+    if not isinstance(hsv, list) or len(hsv) != 3 or not all(isinstance(part, int) for part in hsv):
+        raise ValueError(f"expected [hue, saturation, value] integers, got {hsv!r}")
+    color = Color(*hsv)
+    if not (0 <= color.hue <= 360 and 0 <= color.saturation <= 100 and 0 <= color.value <= 100):
+        raise ValueError(f"HSV values out of range: {hsv!r}")
+    return color
+
+# Function to load the team colors, including custom ones, once at startup
+def load_team_palettes(path=TEAM_COLORS_FILE):
+    """Merge custom team colors from a JSON file (if it exists) over TEAM_COLORS into TEAM_PALETTES."""
+    global TEAM_PALETTES
+    
+    palettes = dict(TEAM_COLORS)
+    if path and os.path.exists(path):
+        try:
+            with open(path) as f:
+                custom = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: couldn't read team colors from {path}: {e}")
+            custom = {}
+        if not isinstance(custom, dict):
+            print(f"Warning: couldn't read team colors from {path}: expected an object of team colors")
+            custom = {}
         
-        # Set HSV values
-        await light.set_hsv(hue, saturation, value, transition=100)
-    except Exception as e:
-        print(f"Error setting bulb color: {e}")
+        for team_abbrev, colors in custom.items():
+            try:
+                palettes[team_abbrev.upper()] = TeamPalette(parse_color(colors["primary"]), parse_color(colors["secondary"]))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Warning: ignoring custom colors for {team_abbrev}: {e}")
+    
+    TEAM_PALETTES = MappingProxyType(palettes)
+    compile_celebration.cache_clear()  # Celebrations compiled with the old colors are out of date
+    return TEAM_PALETTES
+
+# Function to build the bytes a bulb is sent for a light state change
+def encode_light_state(state):
+    """Serialize and encrypt a transition_light_state command with the given fields."""
+    from kasa.transports.xortransport import XorEncryption
+    
+    request = {LIGHT_SERVICE: {"transition_light_state": state}}
+    return XorEncryption.encrypt(json.dumps(request, separators=(",", ":")))
 
-# Function to flash the bulb with team colors
-async def flash_team_colors(ip, team_abbrev, duration=30, interval=0.5):
-    """Flashes the bulb with the team's colors for the specified duration."""
-    bulb = IotBulb(ip)  # Create an IotBulb object to interact with the bulb
-    await bulb.update()  # Update the current state of the bulb
+# Function to build the bytes a bulb is sent for one animation frame
+@functools.lru_cache(maxsize=None)
+def light_state_payload(hue, saturation, value, transition):
+    """Build the transition_light_state command set_hsv would send, once per distinct frame."""
+    return encode_light_state({
+        "hue": hue,
+        "saturation": saturation,
+        "color_temp": 0,
+        "brightness": value,
+        "transition_period": transition,
+        "on_off": 1,
+        "ignore_default": 1
+    })
 
-    # Get team colors, ensuring brightness (value) is always 100
-    team_colors = TEAM_COLORS.get(team_abbrev, {"primary": [0, 100, 100], "secondary": [0, 0, 100]})
+# Function to build a team's celebration once so every goal reuses the same frames
+@functools.lru_cache(maxsize=None)
+def compile_celebration(team_abbrev, pattern=FLASH_PATTERN, duration=FLASH_DURATION, interval=FLASH_INTERVAL):
+    """Compile a team's celebration into an immutable tuple of frames, each carrying its ready-to-send bytes."""
+    palette = TEAM_PALETTES.get(team_abbrev, DEFAULT_TEAM_COLORS)
+    
+    # Celebrate with the team colors at full brightness (value 100)
+    primary = palette.primary._replace(value=100)
+    secondary = palette.secondary._replace(value=100)
+    
+    def frame(offset, hue, saturation, value, transition):
+        return Frame(offset, hue, saturation, value, transition, light_state_payload(hue, saturation, value, transition))
     
-    primary = team_colors["primary"]
-    secondary = team_colors["secondary"]
+    frames = []
+    if pattern == "toggle":
+        # Hard cuts between the two colors
+        for step in range(int(duration / interval)):
+            color = primary if step % 2 == 0 else secondary
+            frames.append(frame(step * interval, *color, 0))
+    elif pattern == "strobe":
+        # Short bursts of each color separated by dark gaps
+        step_time = interval / 2
+        for step in range(int(duration / step_time)):
+            color = primary if (step // 2) % 2 == 0 else secondary
+            value = color.value if step % 2 == 0 else STROBE_DARK_VALUE
+            frames.append(frame(step * step_time, color.hue, color.saturation, value, 0))
+    elif pattern == "pulse":
+        # Each color brightens and dims smoothly before handing over to the other
+        step_time = interval / 2
+        for step in range(int(duration / step_time)):
+            color = primary if (step // 2) % 2 == 0 else secondary
+            value = color.value if step % 2 == 0 else PULSE_LOW_VALUE
+            frames.append(frame(step * step_time, color.hue, color.saturation, value, int(step_time * 1000)))
+    elif pattern == "fade":
+        # Smooth cross-fades between the two colors
+        for step in range(int(duration / interval)):
+            color = primary if step % 2 == 0 else secondary
+            frames.append(frame(step * interval, *color, int(interval * 1000)))
+    else:
+        raise ValueError(f"Unknown flash pattern: {pattern}")
     
-    # Set brightness (value) to 100
-    primary[2] = 100
-    secondary[2] = 100
+    return tuple(frames)
 
-    end_time = asyncio.get_event_loop().time() + duration  # Calculate when the flashing should stop
-    while asyncio.get_event_loop().time() < end_time:  # Keep flashing until the specified duration has passed
-        # Set primary color
-        await set_bulb_color(bulb, primary[0], primary[1], primary[2])
-        await asyncio.sleep(interval)  # Wait for the specified interval before changing the color
+# Function to record goal-to-light latency for the first frame of a celebration
+def track_first_frame(goal, task):
+    """Record when a goal's first bulb command went out and, once a bulb accepts it, when it was acknowledged."""
+    loop = asyncio.get_running_loop()
+    game_id = goal["game_id"]
+    if "command_sent_at" not in goal:
+        goal["command_sent_at"] = loop.time()
+        METRICS.observe(game_id, "detect_to_command", goal["command_sent_at"] - goal["detected_at"])
+    
+    def acknowledged(task):
+        if task.cancelled() or not task.result() or "command_acked_at" in goal:
+            return
+        goal["command_acked_at"] = loop.time()
+        METRICS.observe(game_id, "command_to_ack", goal["command_acked_at"] - goal["command_sent_at"])
+        METRICS.observe(game_id, "detect_to_light", goal["command_acked_at"] - goal["detected_at"])
+        if goal["api_updated_at"] is not None:
+            METRICS.observe(game_id, "api_to_light", time.time() - goal["api_updated_at"])
+    
+    task.add_done_callback(acknowledged)
+
+# Function to play a compiled celebration against absolute deadlines
+async def play_frames(session, frames, duration, start, lead=0, goal=None):
+    """Send each frame at its scheduled time, dropping frames that can't go out on time instead of falling behind.
 
-        # Set secondary color
-        await set_bulb_color(bulb, secondary[0], secondary[1], secondary[2])
-        await asyncio.sleep(interval)  # Wait for the specified interval before changing the color again
+    Frames are due at start + offset (loop time) and are sent lead seconds early to make up for the bulb's latency.
+    If a goal event is given, its first frame is tracked for latency metrics.
+    """
+    loop = asyncio.get_running_loop()
+    start -= lead
+    in_flight = None  # The frame currently being sent to the bulb
     
-    # Restore original state when done
-    await restore_original_bulb_state()
+    for index, frame in enumerate(frames):
+        delay = start + frame.offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        # Drop the frame if its slot has already passed, the bulb is still busy with the previous one,
+        # or the bulb recently stopped responding
+        next_offset = frames[index + 1].offset if index + 1 < len(frames) else duration
+        if loop.time() >= start + next_offset or (in_flight is not None and not in_flight.done()):
+            METRICS.count(f"bulb {session.host}", "frames_dropped")
+            continue
+        if not session.available():
+            continue
+        
+        # Send without waiting for the bulb so a slow response doesn't stretch the pattern
+        first_frame = in_flight is None
+        in_flight = asyncio.create_task(set_bulb_color(session, frame))
+        if first_frame and goal is not None:
+            track_first_frame(goal, in_flight)
+    
+    # Hold the last frame until the celebration is over; a frame still in flight finishes on its own
+    # (commands to a bulb run in order, so it can't land after the restore)
+    delay = start + duration - loop.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
 
-# Function to fetch the current game data
-async def get_game_data(game_id):
-    """Fetches the current game data (team names and scores)."""
-    boxscore_url = f"https://api-web.nhle.com/v1/gamecenter/{game_id}/boxscore"
+# Function to flash the bulbs with team colors
+async def flash_team_colors(group, team_abbrev, duration=30, interval=FLASH_INTERVAL, pattern=FLASH_PATTERN, goal=None):
+    """Flashes every bulb in the group with the team's colors for the specified duration."""
+    frames = compile_celebration(team_abbrev, pattern, duration, interval)
+    
+    # Start late enough that the slowest bulb can be sent its first frame early
+    leads = group.send_leads()
+    start = asyncio.get_running_loop().time() + max(leads)
+    await asyncio.gather(*(
+        play_frames(session, frames, duration, start, lead, goal)
+        for session, lead in zip(group.sessions, leads)
+    ))
+
+# Function to add a queued event to the pending goals
+def add_goal_event(event, pending):
+    """Add a goal to pending, or for an overturned goal remove the pending goal it cancels.
+
+    Scorer events only carry details for a goal already queued, so they're ignored.
+    Returns False for an overturn that didn't match any pending goal.
+    """
+    if event["type"] == "scorer":
+        return True
+    if event["type"] != "overturn":
+        pending.append(event)
+        return True
+    
+    for index in range(len(pending) - 1, -1, -1):
+        goal = pending[index]
+        if is_same_goal(event, goal):
+            del pending[index]
+            print(f"Dropping overturned {goal['team']} goal before its celebration")
+            return True
+    return False
+
+def is_same_goal(event, goal):
+    """Return True if two events are about the same goal (same game, team and the team's score after it)."""
+    return event["game_id"] == goal["game_id"] and event["team"] == goal["team"] and event.get("score") == goal.get("score")
+
+def is_overturn_of(event, goal):
+    """Return True if an event overturns this particular goal."""
+    return event["type"] == "overturn" and is_same_goal(event, goal)
+
+# Function to move every event already waiting in the queue into the pending list
+def drain_goal_queue(goal_queue, pending):
+    """Move queued events into pending.
+
+    Returns (True if the stop marker (None) was seen, overturns that didn't match a pending goal).
+    """
+    stop = False
+    overturns = []
+    while not goal_queue.empty():
+        event = goal_queue.get_nowait()
+        if event is None:
+            stop = True
+        elif not add_goal_event(event, pending):
+            overturns.append(event)
+    return stop, overturns
+
+# Function to pick the next goal to celebrate
+def take_next_goal(pending):
+    """Pop the next goal worth celebrating, skipping stale goals and merging repeats of the same goal."""
+    now = asyncio.get_running_loop().time()
+    while pending:
+        goal = pending.pop(0)
+        age = now - goal["detected_at"]
+        if age > MAX_GOAL_AGE:
+            print(f"Skipping stale {goal['team']} goal ({age:.0f}s old)")
+            continue
+        
+        # Repeats of this goal share its celebration; every other goal gets its own
+        pending[:] = [other for other in pending if not is_same_goal(other, goal)]
+        return goal
+    return None
+
+# Function to run one goal celebration, handing over early if another goal is waiting
+async def celebrate_goal(goal, goal_queue, pending):
+    """Flash the bulb for a goal, shortening the flash once another goal is waiting
+    and ending it if this goal is overturned.
+
+    Returns True if the stop marker was received while celebrating.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    stop = False
+    flash = asyncio.create_task(flash_team_colors(BULB_GROUP, goal["team"], FLASH_DURATION, goal=goal))
+    
     try:
-        response = requests.get(boxscore_url)  # Make a GET request to fetch the game data
-        if response.status_code == 200:  # Check if the response status is successful (200 OK)
-            data = response.json()  # Parse the response JSON data
+        while not flash.done():
+            drained_stop, overturns = drain_goal_queue(goal_queue, pending)
+            stop = drained_stop or stop
             
-            game_data = {
-                "away_team": data["awayTeam"]["abbrev"],  # Away team abbreviation
-                "home_team": data["homeTeam"]["abbrev"],  # Home team abbreviation
-                "game_state": data.get("gameState", ""),  # Current game state
-            }
+            # Stop right away if the goal we're celebrating was taken back
+            if any(is_overturn_of(event, goal) for event in overturns):
+                print(f"Goal overturned, ending {goal['team']} celebration")
+                break
             
-            # Only include scores if the game has started
-            if "score" in data["awayTeam"] and "score" in data["homeTeam"]:
-                game_data["away_score"] = data["awayTeam"]["score"]
-                game_data["home_score"] = data["homeTeam"]["score"]
+            # Repeats of the goal we're already celebrating don't need their own flash
+            pending[:] = [other for other in pending if not is_same_goal(other, goal)]
+            if pending:
+                # Let this goal show for at least MIN_FLASH_DURATION, then move on to the next one
+                remaining = started + MIN_FLASH_DURATION - loop.time()
+                if remaining > 0:
+                    await asyncio.wait({flash}, timeout=remaining)
+                break
             
-            return game_data
-    except Exception as e:
+            # Wait for the flash to finish or for another goal to arrive
+            getter = asyncio.create_task(goal_queue.get())
+            await asyncio.wait({flash, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                event = getter.result()
+                if event is None:
+                    stop = True
+                elif not add_goal_event(event, pending) and is_overturn_of(event, goal):
+                    print(f"Goal overturned, ending {goal['team']} celebration")
+                    break
+            else:
+                getter.cancel()
+    finally:
+        flash.cancel()
+        results = await asyncio.gather(flash, return_exceptions=True)
+        if isinstance(results[0], Exception):
+            print(f"Error flashing bulb: {results[0]}")
+    return stop
+
+# Function that owns the bulb and turns goal events into celebrations
+async def light_controller(goal_queue, bulbs_captured=None):
+    """Celebrate goals from the queue one at a time, restoring the bulb whenever the queue runs dry.
+
+    Putting None on the queue stops the controller after any pending celebrations finish. If given,
+    bulbs_captured (the task capturing the bulbs' original state) is waited for before anything is shown.
+    """
+    # Goals detected meanwhile wait in the queue
+    if bulbs_captured is not None:
+        await bulbs_captured
+    
+    pending = []  # Goals waiting for their celebration
+    while True:
+        if not pending:
+            # Bulbs the last restore couldn't reach get another try once they're due, unless a goal comes first
+            getter = asyncio.create_task(goal_queue.get())
+            await asyncio.wait({getter}, timeout=restore_retry_delay())
+            if not getter.done():
+                getter.cancel()
+                await restore_original_bulb_state()
+                continue
+            event = getter.result()
+            if event is None:
+                return
+            add_goal_event(event, pending)
+            if not pending:
+                continue
+        
+        # Celebrate everything that's waiting, then put the bulb back the way it was
+        celebrated = False
+        stop = False
+        while True:
+            drained_stop, overturns = drain_goal_queue(goal_queue, pending)
+            stop = drained_stop or stop
+            goal = take_next_goal(pending)
+            if goal is None:
+                break
+            celebrated = True
+            stop = await celebrate_goal(goal, goal_queue, pending) or stop
+        
+        if celebrated:
+            await restore_original_bulb_state()
+        if stop:
+            return
+
+# Function to pull the fields we track out of a boxscore or score feed game entry
+def parse_game_data(data):
+    """Extract team names, scores and game state from an NHL API game object into a GameSnapshot."""
+    away = data["awayTeam"]
+    home = data["homeTeam"]
+    
+    # Scores are only present once the game has started
+    if "score" in away and "score" in home:
+        return GameSnapshot(away["abbrev"], home["abbrev"], data.get("gameState", ""), away["score"], home["score"])
+    return GameSnapshot(away["abbrev"], home["abbrev"], data.get("gameState", ""), None, None)
+
+# Function to fetch the current game data
+async def get_game_data(game_id):
+    """Fetches the current game data (team names and scores)."""
+    boxscore_url = f"{NHL_API_BASE}/gamecenter/{game_id}/boxscore"
+    try:
+        # Fetch the game data without blocking other games, skipping the player stats we don't use
+        _, data, _ = await poll_json(boxscore_url, f"game {game_id}", decode=decode_boxscore)
+        if data is not None:  # Check if the request was successful (200 OK)
+            return parse_game_data(data)
+    except Exception:
         # Don't print errors for games that haven't started yet
         pass
     return None  # Return None if no data could be fetched or an error occurred
 
+# Shared poller that fetches the daily score feed for every monitored game
+class ScoreboardPoller:
+    """Poll the all-games score feed on a state-aware schedule and publish per-game changes to subscribers."""
+
+    def __init__(self, interval=CHECK_INTERVAL):
+        self.interval = interval  # Poll interval during live play
+        self.subscribers = {}  # game_id -> {"date", "start_time", "next_poll", "queue"}
+        self.last_published = {}  # game_id -> last game data sent to the subscriber
+        self.fresh_until = {}  # date -> loop time until which the API says the score feed won't change
+        self.failures = {}  # date or game_id -> consecutive failed polls
+        self.wakeup = asyncio.Event()
+
+    def subscribe(self, game_id, game_date, start_time_utc):
+        """Start receiving updates for a game; returns the queue updates are published to."""
+        queue = asyncio.Queue()
+        self.subscribers[game_id] = {
+            "date": game_date,
+            "start_time": start_time_utc,
+            "start_time_str": None,
+            "next_poll": 0,  # Poll right away to learn the game's current state
+            "queue": queue
+        }
+        self.wakeup.set()
+        return queue
+
+    def unsubscribe(self, game_id):
+        """Stop receiving updates for a game."""
+        self.subscribers.pop(game_id, None)
+        self.last_published.pop(game_id, None)
+
+    def publish(self, game_id, game_data, updated_at=None):
+        """Send game data to the game's subscriber if anything changed since the last update.
+
+        The update is tagged with when the API produced it (Unix time, or None if unknown).
+        """
+        subscriber = self.subscribers.get(game_id)
+        if subscriber is None or self.last_published.get(game_id) == game_data:
+            return
+        self.last_published[game_id] = game_data
+        subscriber["queue"].put_nowait(game_data._replace(api_updated_at=updated_at))
+
+    def poll_delay(self, subscriber, game):
+        """Pick how long (in seconds) to wait before polling a game again, based on its live state."""
+        game_state = game.get("gameState", "")
+        
+        # Nothing more will change once the game is over
+        if game_state in ["FINAL", "OFF"]:
+            return INTERMISSION_INTERVAL
+        
+        # Before puck drop, sleep until shortly before the (possibly rescheduled) start time
+        if game_state in ["FUT", "PRE"]:
+            start_time_str = game.get("startTimeUTC")
+            if start_time_str and start_time_str != subscriber["start_time_str"]:
+                subscriber["start_time"] = parse_utc_time(start_time_str)
+                subscriber["start_time_str"] = start_time_str
+            until_start = (subscriber["start_time"] - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+            if until_start > PREGAME_LEAD_TIME:
+                return until_start - PREGAME_LEAD_TIME
+            return PREGAME_INTERVAL
+        
+        # During an intermission, check occasionally and speed up as the intermission clock runs out
+        clock = game.get("clock", {})
+        if clock.get("inIntermission"):
+            remaining = clock.get("secondsRemaining", 0)
+            return max(self.interval, min(INTERMISSION_INTERVAL, remaining - PREGAME_INTERVAL))
+        
+        # Live play, stoppages and reviews all need fast polling since goals can post at any time
+        return self.interval
+
+    def retry_delay(self, key):
+        """Count a failed poll of a date or game and return how long to wait before trying again.
+
+        Backs off exponentially with jitter from the live interval up to MAX_BACKOFF, and never retries
+        before the circuit breaker lets requests through again.
+        """
+        failures = self.failures.get(key, 0) + 1
+        self.failures[key] = failures
+        delay = min(MAX_BACKOFF, self.interval * 2 ** min(failures - 1, 10))
+        delay = random.uniform(delay / 2, delay)
+        if API_BREAKER.open_until is not None:
+            delay = max(delay, API_BREAKER.open_until - asyncio.get_running_loop().time())
+        return delay
+
+    async def fetch_scoreboard(self, date):
+        """Fetch the score feed for one date.
+
+        Returns (games keyed by ID, seconds the feed stays fresh, when the API produced it).
+        """
+        try:
+            _, data, headers = await poll_json(f"{NHL_API_BASE}/score/{date}", "score feed")
+        except Exception:
+            return None, 0, None
+        if data is None:
+            return None, cache_freshness(headers), None
+        games = {game["id"]: game for game in data.get("games", [])}
+        return games, cache_freshness(headers), api_updated_at(headers)
+
+    async def poll_once(self, dates):
+        """Fetch each due date once and fan the results out to its subscribers."""
+        dates = sorted(dates)
+        results = await asyncio.gather(*(self.fetch_scoreboard(date) for date in dates))
+        now = asyncio.get_running_loop().time()
+        
+        missing = []
+        for date, (games, freshness, updated_at) in zip(dates, results):
+            self.fresh_until[date] = now + freshness
+            if games is None:
+                retry_delay = self.retry_delay(date)
+            else:
+                self.failures.pop(date, None)
+            for game_id, subscriber in list(self.subscribers.items()):
+                if subscriber["date"] != date:
+                    continue
+                if games is None:
+                    # The request failed, back off before trying again
+                    subscriber["next_poll"] = now + retry_delay
+                elif game_id in games:
+                    self.publish(game_id, parse_game_data(games[game_id]), updated_at)
+                    subscriber["next_poll"] = now + self.poll_delay(subscriber, games[game_id])
+                else:
+                    missing.append(game_id)
+        
+        # Fall back to the per-game boxscore for anything the score feed didn't include
+        if missing:
+            results = await asyncio.gather(*(get_game_data(game_id) for game_id in missing))
+            for game_id, game_data in zip(missing, results):
+                subscriber = self.subscribers.get(game_id)
+                if subscriber is None:
+                    continue
+                if game_data:
+                    self.failures.pop(game_id, None)
+                    self.publish(game_id, game_data)
+                    game = {"gameState": game_data.game_state}
+                    subscriber["next_poll"] = now + self.poll_delay(subscriber, game)
+                else:
+                    subscriber["next_poll"] = now + self.retry_delay(game_id)
+
+    async def run(self):
+        """Poll until cancelled, sleeping until the next game is due and idling while there is nothing to monitor."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self.wakeup.clear()
+            if not self.subscribers:
+                await self.wakeup.wait()
+                continue
+            
+            # Poll every date that has a game due, unless the API told us the feed hasn't changed yet
+            now = loop.time()
+            due_dates = {
+                subscriber["date"] for subscriber in self.subscribers.values()
+                if subscriber["next_poll"] <= now and self.fresh_until.get(subscriber["date"], 0) <= now
+            }
+            if due_dates:
+                await self.poll_once(due_dates)
+                continue
+            
+            # Sleep until the next game is due, or until a new game subscribes
+            wake_at = min(
+                max(subscriber["next_poll"], self.fresh_until.get(subscriber["date"], 0))
+                for subscriber in self.subscribers.values()
+            )
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), wake_at - now)
+            except asyncio.TimeoutError:
+                pass
+
+# Start of the plays array in a play-by-play feed, and the decoder that reads one play at a time from it
+PLAYS_ARRAY = re.compile(r'"plays"\s*:\s*\[')
+JSON_WHITESPACE = re.compile(r"\s*")
+PLAY_DECODER = json.JSONDecoder()
+
+# Incremental reader for a game's play-by-play feed
+class PlayByPlayCursor:
+    """Remember how far into a game's play-by-play we've read and return only the goals added since.
+
+    The feed always holds the whole game, so after the first read the cursor finds the text of the last
+    play it read and decodes only the plays after it.
+    """
+
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.last_sort_order = None  # sortOrder of the last play we've read (None before the first read)
+        self.last_play_text = None  # Raw text of that play, to find our place in the next feed
+        self.start_scores = {}  # team -> score when we started watching; goals up to it were scored before
+        self.read_once = False  # True after the first successful read
+        self.team_abbrevs = {}  # team ID -> abbreviation
+        self.score_keys = {}  # team ID -> goal details key holding the team's score ("awayScore"/"homeScore")
+        self.goal_counts = {}  # team -> goals read so far, for feeds whose goals don't carry the score
+        self.players = {}  # player ID -> "First Last"
+        self.goals = []  # Goals read so far that haven't been taken back, oldest first
+
+    def start_from(self, scores):
+        """Skip the goals up to these scores ({team: score}) on the first read, since they were scored before we started watching."""
+        self.start_scores = dict(scores)
+
+    async def fetch_new_goals(self):
+        """Fetch the feed and return the goals added since the last successful fetch (empty if the request failed)."""
+        try:
+            _, text, _ = await poll_json(
+                f"{NHL_API_BASE}/gamecenter/{self.game_id}/play-by-play",
+                f"game {self.game_id}",
+                decode=bytes.decode,
+                deadline=PLAY_BY_PLAY_DEADLINE
+            )
+            if text is None:
+                return []
+            first_read = not self.read_once
+            goals = self.read_new_goals(text)
+        except Exception:
+            return []
+        
+        self.read_once = True
+        if first_read:
+            goals = [goal for goal in goals if goal["score"] > self.start_scores.get(goal["team"], -1)]
+        return goals
+
+    def read_new_goals(self, text):
+        """Read the plays after the cursor and return the goals among them."""
+        if not self.team_abbrevs:
+            data = decode_json(text)
+            for side, score_key in [("awayTeam", "awayScore"), ("homeTeam", "homeScore")]:
+                self.team_abbrevs[data[side]["id"]] = data[side]["abbrev"]
+                self.score_keys[data[side]["id"]] = score_key
+            for spot in data.get("rosterSpots", []):
+                self.players[spot["playerId"]] = f"{spot['firstName']['default']} {spot['lastName']['default']}"
+        
+        goals = []
+        for play in self.read_new_plays(text):
+            self.last_sort_order = play.get("sortOrder", 0)
+            if play.get("typeDescKey") != "goal":
+                continue
+            details = play.get("details", {})
+            team_id = details.get("eventOwnerTeamId")
+            team = self.team_abbrevs.get(team_id)
+            self.goal_counts[team] = self.goal_counts.get(team, 0) + 1
+            goal = {
+                "event_id": play.get("eventId"),
+                "team": team,
+                "score": details.get(self.score_keys.get(team_id), self.goal_counts[team]),
+                "scorer": self.players.get(details.get("scoringPlayerId")),
+                "period": play.get("periodDescriptor", {}).get("number"),
+                "time_in_period": play.get("timeInPeriod")
+            }
+            goals.append(goal)
+            self.goals.append(goal)
+        return goals
+
+    def read_new_plays(self, text):
+        """Decode only the plays after the last one we read, so the work is proportional to new plays.
+
+        Falls back to decoding every play (skipping those at or before our sortOrder) on the first read,
+        or if the last play we read was edited since.
+        """
+        if self.last_play_text is not None:
+            index = text.find(self.last_play_text)
+            if index >= 0:
+                return self.decode_plays(text, index + len(self.last_play_text))
+        
+        match = PLAYS_ARRAY.search(text)
+        if match is None:
+            return []
+        plays = self.decode_plays(text, match.end())
+        if self.last_sort_order is not None:
+            plays = [play for play in plays if play.get("sortOrder", 0) > self.last_sort_order]
+        return plays
+
+    def decode_plays(self, text, index):
+        """Decode the plays from index (just after "[" or after a play) to the end of the plays array."""
+        plays = []
+        while True:
+            index = JSON_WHITESPACE.match(text, index).end()
+            if text.startswith("]", index):
+                return plays
+            if text.startswith(",", index):
+                index = JSON_WHITESPACE.match(text, index + 1).end()
+            start = index
+            play, index = PLAY_DECODER.raw_decode(text, index)
+            plays.append(play)
+            self.last_play_text = text[start:index]
+
+    def take_back_goal(self, team, score):
+        """Forget a team's goal after it was overturned (the one that made it score, else its latest); returns it (None if unknown)."""
+        team_goals = [index for index, goal in enumerate(self.goals) if goal["team"] == team]
+        for index in reversed(team_goals):
+            if self.goals[index]["score"] == score:
+                return self.goals.pop(index)
+        if team_goals:
+            return self.goals.pop(team_goals[-1])
+        return None
+
+def describe_goal(details):
+    """Format a goal's scorer and time for printing (empty if we don't have the details)."""
+    if not details or not details.get("scorer"):
+        return ""
+    return f" ({details['scorer']}, {details['time_in_period']} of period {details['period']})"
+
+# Function to report who scored once the play-by-play has the goals
+async def announce_scorers(cursor, goal_queue, previous=None):
+    """Read the plays added since the last lookup, then print and queue a scorer event for each new goal.
+
+    Runs after the goals were queued so the lookup never delays a celebration; waits for the previous
+    lookup for the same game first so the cursor is read in order.
+    """
+    if previous is not None:
+        await asyncio.gather(previous, return_exceptions=True)
+    for details in await cursor.fetch_new_goals():
+        if details["scorer"]:
+            print(f"{details['team']} goal{describe_goal(details)}")
+            goal_queue.put_nowait(new_scorer_event(cursor.game_id, details))
+
+# Function to build a goal event for the light controller
+def new_goal_event(game_id, team, score, game_data):
+    """Create a goal event and record how long after the API update it was detected.
+
+    score is the team's score after the goal, which tells two goals in one update apart.
+    """
+    goal = {
+        "type": "goal",
+        "game_id": game_id,
+        "team": team,
+        "score": score,
+        "detected_at": asyncio.get_running_loop().time(),  # Loop time, for goal age and latency
+        "api_updated_at": game_data.api_updated_at  # Unix time the API produced the update
+    }
+    METRICS.count(game_id, "goals")
+    if goal["api_updated_at"] is not None:
+        METRICS.observe(game_id, "api_to_detect", time.time() - goal["api_updated_at"])
+    return goal
+
+# Function to build the follow-up event that says who scored a goal
+def new_scorer_event(game_id, details):
+    """Create an event with a goal's scorer and time in period, matched to its goal event by team and score."""
+    return {
+        **details,
+        "type": "scorer",
+        "game_id": game_id,
+        "detected_at": asyncio.get_running_loop().time()
+    }
+
+# Function to build an overturned goal event for the light controller
+def new_overturn_event(game_id, team, score, details=None):
+    """Create an event that cancels the celebration of the team's goal that made it score."""
+    METRICS.count(game_id, "goals_overturned")
+    return {
+        **(details or {}),
+        "type": "overturn",
+        "game_id": game_id,
+        "team": team,
+        "score": score,
+        "detected_at": asyncio.get_running_loop().time()
+    }
+
 # Function to monitor a single game and flash the bulb on goals
-async def monitor_game(game_info, bulb_lock):
-    """Monitor a single game for goals and flash the bulb when a goal is scored."""
+async def monitor_game(game_info, goal_queue, poller, on_update=None):
+    """Monitor a single game for goals and queue a goal event for the light controller when one is scored.
+
+    If given, on_update is called with every game update once its goals have been queued.
+    """
     game_id = game_info["id"]
     away_team = game_info["away_team"]
     home_team = game_info["home_team"]
     start_time_utc = game_info["start_time_utc"]
     
     # Convert to local time for display
-    local_tz = datetime.datetime.now().astimezone().tzinfo
-    local_start = start_time_utc.astimezone(local_tz)
+    local_start = start_time_utc.astimezone()
     time_str = local_start.strftime("%I:%M %p")
     
     # Print game info with start time in brackets
     print(f"Game {away_team} @ {home_team} [{time_str}]")
     
-    # Check if game is in the future
-    now = datetime.datetime.now(pytz.utc)
-    if start_time_utc > now:
-        # If game starts more than 5 minutes from now, wait until closer to game time
-        if (start_time_utc - now).total_seconds() > 300:  # More than 5 minutes
-            wait_time = (start_time_utc - now).total_seconds() - 300  # Wait until 5 minutes before game
-            await asyncio.sleep(wait_time)
-            print(f"Getting ready for {away_team} @ {home_team} game [starts in 5 minutes]")
-    
     # Initialize scores to None, indicating game hasn't started
     last_away_score = None
     last_home_score = None
     game_started = False
     game_ended = False
     waiting_printed = False  # Flag to track if we've printed the waiting message
+    ready_printed = False  # Flag to track if we've printed the pre-game message
+    
+    # Scorers are looked up in the play-by-play in the background, one lookup at a time
+    cursor = PlayByPlayCursor(game_id) if PLAY_BY_PLAY else None
+    lookup = None  # The latest scorer lookup task
     
-    # Keep checking until the game ends
+    # Receive updates from the shared poller until the game ends; the poller decides when to check
+    updates = poller.subscribe(game_id, game_info["game_date"], start_time_utc)
     while not game_ended:
-        game_data = await get_game_data(game_id)
+        game_data = await updates.get()
         
         if game_data:
-            game_state = game_data.get("game_state", "")
+            game_state = game_data.game_state
+            
+            # Announce once the game enters its pre-game window
+            if game_state == "PRE" and not ready_printed:
+                print(f"Getting ready for {away_team} @ {home_team} game")
+                ready_printed = True
             
-            # Check if game has ended
-            if game_state in ["FINAL", "OFF"]:
-                if "away_score" in game_data and "home_score" in game_data:
-                    final_away = game_data["away_score"]
-                    final_home = game_data["home_score"]
-                    print(f"Game has ended: {away_team} {final_away} - {home_team} {final_home}")
-                else:
-                    print(f"Game has ended: {away_team} @ {home_team}")
-                game_ended = True
-                break
-                
             # Check if game has scores (has started)
-            if "away_score" in game_data and "home_score" in game_data:
-                away_score = game_data["away_score"]
-                home_score = game_data["home_score"]
+            if game_data.away_score is not None and game_data.home_score is not None:
+                away_score = game_data.away_score
+                home_score = game_data.home_score
                 
                 # Announce game start if this is the first time we see scores
                 if not game_started:
@@ -384,16 +1764,29 @@ async def monitor_game(game_info, bulb_lock):
                     game_started = True
                     last_away_score = away_score
                     last_home_score = home_score
-                else:
-                    # Check for goals
-                    if away_score > last_away_score:
-                        print(f"GOAL! {away_team} scored! Score: {away_team} {away_score} - {home_team} {home_score}")
-                        async with bulb_lock:
-                            await flash_team_colors(BULB_IP, away_team, FLASH_DURATION)
-                    elif home_score > last_home_score:
-                        print(f"GOAL! {home_team} scored! Score: {away_team} {away_score} - {home_team} {home_score}")
-                        async with bulb_lock:
-                            await flash_team_colors(BULB_IP, home_team, FLASH_DURATION)
+                    
+                    # Move the play-by-play cursor past goals scored before we started watching
+                    if cursor is not None:
+                        cursor.start_from({away_team: away_score, home_team: home_score})
+                        lookup = asyncio.create_task(announce_scorers(cursor, goal_queue))
+                elif away_score != last_away_score or home_score != last_home_score:
+                    # Queue one event per goal so two quick goals both get celebrated, and an
+                    # overturn for every goal taken back, without pausing polling
+                    for team, score, last_score in [
+                        (away_team, away_score, last_away_score),
+                        (home_team, home_score, last_home_score)
+                    ]:
+                        for goal_score in range(last_score + 1, score + 1):
+                            print(f"GOAL! {team} scored! Score: {away_team} {away_score} - {home_team} {home_score}")
+                            goal_queue.put_nowait(new_goal_event(game_id, team, goal_score, game_data))
+                        for goal_score in range(last_score, score, -1):
+                            details = cursor.take_back_goal(team, goal_score) if cursor is not None else None
+                            print(f"Goal overturned! {team} goal{describe_goal(details)} taken back. Score: {away_team} {away_score} - {home_team} {home_score}")
+                            goal_queue.put_nowait(new_overturn_event(game_id, team, goal_score, details))
+                    
+                    # Then read only the plays added since last time to report each new goal's scorer and time
+                    if cursor is not None and (away_score > last_away_score or home_score > last_home_score):
+                        lookup = asyncio.create_task(announce_scorers(cursor, goal_queue, lookup))
                     
                     # Update scores
                     last_away_score = away_score
@@ -402,46 +1795,408 @@ async def monitor_game(game_info, bulb_lock):
                 # Game hasn't started yet
                 if not game_started and not waiting_printed:
                     # Check if we're close to game time
-                    now = datetime.datetime.now(pytz.utc)
+                    now = datetime.datetime.now(datetime.timezone.utc)
                     if start_time_utc <= now:
                         print(f"Waiting for {away_team} @ {home_team} game to start...")
                         waiting_printed = True  # Set flag so we only print this once
+            
+            if on_update is not None:
+                on_update(game_id, game_data)
+            
+            # Check if game has ended (after handling its score, so a final goal still counts)
+            if game_state in ["FINAL", "OFF"]:
+                if game_data.away_score is not None and game_data.home_score is not None:
+                    final_away = game_data.away_score
+                    final_home = game_data.home_score
+                    print(f"Game has ended: {away_team} {final_away} - {home_team} {final_home}")
+                else:
+                    print(f"Game has ended: {away_team} @ {home_team}")
+                game_ended = True
+                break
+    
+    poller.unsubscribe(game_id)
+    
+    # Let the last scorer lookup finish printing
+    if lookup is not None:
+        await lookup
+
+# Hub that polls the NHL API once for every goal light on the network
+class ScoreHub:
+    """Serve today's schedule at /games and stream score and goal events at /events?games=ID,ID as server-sent events.
+
+    Each game is monitored from the first time a client asks for it, so upstream polling doesn't grow with clients.
+    """
+
+    def __init__(self, games):
+        self.games = {game["id"]: game for game in games}  # Today's schedule entries by game ID
+        self.poller = ScoreboardPoller()
+        self.monitors = {}  # game_id -> monitor task
+        self.latest = {}  # game_id -> last score event sent, for clients that join later
+        self.clients = {}  # client queue -> game IDs it follows
+
+    def broadcast(self, event):
+        """Encode an event once and queue it for every client following its game."""
+        event = dict(event, hub_sent_at=time.time())
+        message = b"data: " + json.dumps(event).encode() + b"\n\n"
+        if event["type"] == "score":
+            self.latest[event["game_id"]] = message
+        for queue, game_ids in list(self.clients.items()):
+            if event["game_id"] not in game_ids:
+                continue
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Let the client reconnect rather than buffering forever for it: drop what it hasn't
+                # read so the stop marker fits
+                self.clients.pop(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def put_nowait(self, event):
+        """Take goal, overturn and scorer events from the monitors (the hub stands in for the light controller's queue)."""
+        self.broadcast(event)
+
+    def update(self, game_id, game_data):
+        """Send a game's latest state to its clients."""
+        self.broadcast({"type": "score", "game_id": game_id, **game_data._asdict()})
+
+    def ensure_monitored(self, game_id):
+        """Start monitoring a game if nobody asked for it before."""
+        if game_id not in self.monitors:
+            game_info = get_game_info(self.games[game_id])
+            self.monitors[game_id] = asyncio.create_task(monitor_game(game_info, self, self.poller, self.update))
+
+    async def handle_games(self, request):
+        from aiohttp import web
+        return web.json_response(list(self.games.values()))
+
+    async def handle_events(self, request):
+        from aiohttp import web
+        
+        try:
+            game_ids = {int(game_id) for game_id in request.query.get("games", "").split(",") if game_id}
+        except ValueError:
+            raise web.HTTPBadRequest(text="games must be comma-separated game IDs")
+        unknown = game_ids - set(self.games)
+        if unknown or not game_ids:
+            raise web.HTTPNotFound(text=f"Not on today's schedule: {sorted(unknown)}")
+        
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
         
-        # Wait before checking again
-        await asyncio.sleep(CHECK_INTERVAL)
+        queue = asyncio.Queue(HUB_CLIENT_BACKLOG)
+        for game_id in game_ids:
+            self.ensure_monitored(game_id)
+            if game_id in self.latest:
+                queue.put_nowait(self.latest[game_id])
+        self.clients[queue] = game_ids
+        print(f"Hub client {request.remote} following {len(game_ids)} games ({len(self.clients)} connected)")
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HUB_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    message = b": keep-alive\n\n"
+                if message is None:
+                    break
+                await response.write(message)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(queue, None)
+        return response
+
+    async def run(self, port):
+        """Serve clients until cancelled."""
+        from aiohttp import web
+        
+        app = web.Application()
+        app.router.add_get("/games", self.handle_games)
+        app.router.add_get("/events", self.handle_events)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "0.0.0.0", port).start()
+        print(f"Hub serving {len(self.games)} games at http://0.0.0.0:{port}")
+        
+        poller_task = asyncio.create_task(self.poller.run())
+        try:
+            await asyncio.Event().wait()
+        finally:
+            poller_task.cancel()
+            for task in self.monitors.values():
+                task.cancel()
+            await runner.cleanup()
+
+# Function to get today's games from a hub instead of the NHL API
+async def fetch_hub_games():
+    """Fetch the schedule the hub is serving."""
+    try:
+        async with get_http_session().get(f"{HUB_URL}/games") as response:
+            response.raise_for_status()
+            return await response.json()
+    except Exception as e:
+        print(f"Error fetching games from hub {HUB_URL}: {e}")
+        return []
+
+# Function to receive score and goal events from a hub
+async def follow_hub(selected_games, goal_queue):
+    """Queue goals streamed by the hub for the light controller until every selected game has ended.
+
+    Reconnects with backoff if the stream drops; goals scored while disconnected are not replayed.
+    """
+    import aiohttp
+    
+    loop = asyncio.get_running_loop()
+    remaining = {game_info["id"]: game_info for game_info in selected_games}
+    failures = 0
+    
+    while remaining:
+        try:
+            # The stream stays open for hours, so it gets its own session instead of a slot in the API pool
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=HUB_HEARTBEAT_INTERVAL * 3)
+            ) as session, session.get(
+                f"{HUB_URL}/events",
+                params={"games": ",".join(str(game_id) for game_id in remaining)}
+            ) as response:
+                response.raise_for_status()
+                print(f"Connected to hub {HUB_URL}")
+                failures = 0
+                async for line in response.content:
+                    if not line.startswith(b"data:"):
+                        continue
+                    event = decode_json(line[5:])
+                    game_id = event["game_id"]
+                    if game_id not in remaining:
+                        continue
+                    
+                    if event["type"] == "score":
+                        if event["game_state"] in ["FINAL", "OFF"]:
+                            game_info = remaining.pop(game_id)
+                            if event["away_score"] is not None and event["home_score"] is not None:
+                                print(f"Game has ended: {game_info['away_team']} {event['away_score']} - {game_info['home_team']} {event['home_score']}")
+                            else:
+                                print(f"Game has ended: {game_info['away_team']} @ {game_info['home_team']}")
+                            if not remaining:
+                                break
+                        continue
+                    
+                    if event["type"] == "scorer":
+                        print(f"{event['team']} goal{describe_goal(event)}")
+                        continue
+                    
+                    # Goal and overturn events: age them from when they reached us
+                    event["detected_at"] = loop.time()
+                    METRICS.observe(game_id, "hub_to_client", max(0, time.time() - event["hub_sent_at"]))
+                    if event["type"] == "goal":
+                        METRICS.count(game_id, "goals")
+                        print(f"GOAL! {event['team']} scored!")
+                    else:
+                        print(f"Goal overturned! {event['team']} goal{describe_goal(event)} taken back.")
+                    goal_queue.put_nowait(event)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            failures += 1
+            delay = random.uniform(0.5, 1) * min(MAX_BACKOFF, 2 ** min(failures - 1, 10))
+            print(f"Lost connection to hub {HUB_URL} ({e}); reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+# Scheduler that follows teams all season without anyone picking games
+class GameDayScheduler:
+    """Start monitoring each of the followed teams' games shortly before puck drop.
+
+    A single timer sleeps until the next game's pre-game window (or the next schedule check), so nothing
+    runs and nothing is polled between games.
+    """
+
+    def __init__(self, teams, goal_queue):
+        self.teams = set(teams)
+        self.goal_queue = goal_queue
+        self.poller = ScoreboardPoller()
+        self.monitors = {}  # game_id -> monitor task for games in progress
+        self.finished = set()  # IDs of upcoming games we've already monitored to the end
+        self.changed = asyncio.Event()  # Set when a monitor finishes, to look at the schedule again
+
+    async def upcoming_games(self):
+        """Return the game info of every followed team's game from today through SCHEDULE_LOOKAHEAD_DAYS."""
+        today = datetime.date.fromisoformat(get_todays_date())
+        upcoming = []
+        for offset in range(SCHEDULE_LOOKAHEAD_DAYS):
+            date = (today + datetime.timedelta(days=offset)).isoformat()
+            for game in await fetch_games(date, revalidate=offset == 0) or []:
+                if game.get("gameScheduleState", "OK") != "OK" or game.get("gameState") in ["FINAL", "OFF"]:
+                    continue
+                if game["awayTeam"]["abbrev"] in self.teams or game["homeTeam"]["abbrev"] in self.teams:
+                    upcoming.append(get_game_info(game, date))
+        return upcoming
+
+    async def start_monitor(self, game_info):
+        """Capture the bulbs (if nothing else is being monitored) and start monitoring a game."""
+        if not self.monitors:
+            await capture_original_bulb_state()
+        task = asyncio.create_task(monitor_game(game_info, self.goal_queue, self.poller))
+        self.monitors[game_info["id"]] = task
+        
+        def finished(task):
+            self.monitors.pop(game_info["id"], None)
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                # Leave the game unfinished and wake the scheduler a little later to start it again
+                print(f"Error monitoring {game_info['away_team']} @ {game_info['home_team']}: {task.exception()!r}; "
+                      f"restarting in {MAX_BACKOFF}s")
+                asyncio.get_running_loop().call_later(MAX_BACKOFF, self.changed.set)
+                return
+            self.finished.add(game_info["id"])
+            self.changed.set()
+        
+        task.add_done_callback(finished)
+
+    async def run(self):
+        """Follow the teams until cancelled."""
+        poller_task = asyncio.create_task(self.poller.run())
+        try:
+            while True:
+                games = await self.upcoming_games()
+                self.finished &= {game_info["id"] for game_info in games}
+                
+                # Start every game whose pre-game window has opened and find the next one to wake up for
+                now = datetime.datetime.now(datetime.timezone.utc)
+                wake_at = now + datetime.timedelta(seconds=SCHEDULE_RECHECK_INTERVAL)
+                next_game = None
+                for game_info in games:
+                    if game_info["id"] in self.monitors or game_info["id"] in self.finished:
+                        continue
+                    starts_at = game_info["start_time_utc"] - datetime.timedelta(seconds=PREGAME_LEAD_TIME)
+                    if starts_at <= now:
+                        await self.start_monitor(game_info)
+                    elif starts_at < wake_at:
+                        wake_at = starts_at
+                        next_game = game_info
+                
+                if next_game is not None and not self.monitors:
+                    local_start = next_game["start_time_utc"].astimezone()
+                    print(f"Next game: {next_game['away_team']} @ {next_game['home_team']} on {local_start.strftime('%a %b %d at %I:%M %p')}")
+                
+                # Sleep until then, unless a game finishes first
+                try:
+                    await asyncio.wait_for(self.changed.wait(), (wake_at - now).total_seconds())
+                except asyncio.TimeoutError:
+                    pass
+                self.changed.clear()
+        finally:
+            poller_task.cancel()
+            for task in self.monitors.values():
+                task.cancel()
+
+# Function to run the goal light unattended for the whole season
+async def run_daemon(teams):
+    """Follow the teams' games until interrupted, restoring the bulbs on the way out."""
+    print(f"Following {', '.join(sorted(teams))}")
+    load_team_palettes()
+    
+    metrics_task = asyncio.create_task(metrics_writer()) if METRICS_FILE else None
+    metrics_runner = await start_metrics_server() if METRICS_PORT else None
+    goal_queue = asyncio.Queue()
+    controller_task = asyncio.create_task(light_controller(goal_queue))
+    try:
+        await GameDayScheduler(teams, goal_queue).run()
+    finally:
+        await close_http_session()
+        controller_task.cancel()
+        await asyncio.gather(controller_task, return_exceptions=True)
+        # Only bulbs captured for a game have anything to restore; try every one of them, even those left alone
+        if any(session.state for session in BULB_GROUP.sessions):
+            await restore_original_bulb_state(every_bulb=True)
+        if metrics_task is not None:
+            metrics_task.cancel()
+            await asyncio.gather(metrics_task, return_exceptions=True)
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
 
 async def main():
     """Main function to run the NHL goal light program."""
     print("NHL Goal Light - Initializing...")
     
-    # Capture the original bulb state
-    print("Capturing current bulb state...")
-    success = await capture_original_bulb_state()
-    if not success:
-        print("Warning: Failed to capture original bulb state. Default white will be used after flashing.")
+    # In hub mode this machine only polls the NHL API and streams events to the goal lights
+    if HUB_PORT:
+        hub = ScoreHub(await fetch_todays_games())
+        try:
+            await hub.run(HUB_PORT)
+        finally:
+            await close_http_session()
+        return
+    
+    # With teams to follow, run unattended instead of asking which games to track
+    if FOLLOW_TEAMS:
+        await run_daemon(FOLLOW_TEAMS)
+        return
     
-    print("Fetching today's games...")
-    # Fetch today's games and let the user select multiple games
-    games = fetch_todays_games()
-    selected_games = display_game_options(games)
+    # Capture the original bulb state while fetching today's games (from the hub, if we have one)
+    print("Capturing current bulb state and fetching today's games...")
+    capture_task = asyncio.create_task(capture_original_bulb_state())
+    games = await fetch_hub_games() if HUB_URL else await fetch_todays_games()
+    
+    # Let the user select multiple games, in a thread so the capture keeps going while they choose
+    selected_games = await asyncio.to_thread(display_game_options, games)
     
     if not selected_games:
         print("No games selected. Exiting program.")
+        await capture_task
+        if SCHEDULE_REFRESH_TASK is not None:
+            await SCHEDULE_REFRESH_TASK
+        await close_http_session()
         return
     
     print(f"\nTracking {len(selected_games)} games.")
     
-    # Create a lock to ensure only one task flashes the bulb at a time
-    bulb_lock = asyncio.Lock()
+    # Build every celebration we might play now so a goal only has to send bytes
+    load_team_palettes()
+    for game_info in selected_games:
+        for team_abbrev in [game_info["away_team"], game_info["home_team"]]:
+            compile_celebration(team_abbrev, FLASH_PATTERN, FLASH_DURATION, FLASH_INTERVAL)
+    
+    # Export latency metrics while we run
+    metrics_task = asyncio.create_task(metrics_writer()) if METRICS_FILE else None
+    metrics_runner = await start_metrics_server() if METRICS_PORT else None
     
-    # Create tasks for monitoring each selected game
+    # Goal events are queued for a single light controller task so polling never waits on the bulb,
+    # and tracking starts without waiting for the bulb capture (the controller waits for it instead)
+    goal_queue = asyncio.Queue()
+    controller_task = asyncio.create_task(light_controller(goal_queue, capture_task))
+    
+    # Create tasks for monitoring each selected game, fed by a shared poller unless the hub is polling for us
     tasks = []
-    for game_info in selected_games:
-        task = asyncio.create_task(monitor_game(game_info, bulb_lock))
-        tasks.append(task)
+    poller_task = None
+    if HUB_URL:
+        tasks.append(asyncio.create_task(follow_hub(selected_games, goal_queue)))
+    else:
+        poller = ScoreboardPoller()
+        poller_task = asyncio.create_task(poller.run())
+        for game_info in selected_games:
+            task = asyncio.create_task(monitor_game(game_info, goal_queue, poller))
+            tasks.append(task)
     
     # Wait for all monitoring tasks to complete
-    await asyncio.gather(*tasks)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        if poller_task is not None:
+            poller_task.cancel()
+        await close_http_session()
+    
+    # Let any final celebration finish before exiting, then try once more to restore any bulb it couldn't
+    goal_queue.put_nowait(None)
+    await controller_task
+    if any(session.restore_pending for session in BULB_GROUP.sessions):
+        await restore_original_bulb_state(every_bulb=True)
+    
+    # Write the final metrics and stop serving them
+    if metrics_task is not None:
+        metrics_task.cancel()
+        await asyncio.gather(metrics_task, return_exceptions=True)
+    if metrics_runner is not None:
+        await metrics_runner.cleanup()
     
     print("All games have ended. Exiting program.")
 